@@ -66,7 +66,9 @@ def update_agent_performance():
         tenantuser__role__in=['agent', 'admin']
     ).distinct()
 
-    for agent in agents:
+    # Stream agents in chunks rather than holding every User row while
+    # the per-agent aggregation queries run
+    for agent in agents.iterator(chunk_size=500):
         # Get tickets for today
         tickets = Ticket.objects.filter(
             assigned_agent=agent,
@@ -1,8 +1,12 @@
+import logging
+
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from .models import Message, Conversation
 # from .sentiment_analyzer import sentiment_analyzer  # Temporarily disabled
 
+logger = logging.getLogger(__name__)
+
 
 @receiver(post_save, sender=Message)
 def analyze_message_sentiment(sender, instance, created, **kwargs):
@@ -22,7 +26,7 @@ def analyze_message_sentiment(sender, instance, created, **kwargs):
             update_conversation_sentiment(conversation)
 
         except Exception as e:
-            print(f"Error analyzing sentiment: {e}")
+            logger.exception(f"Error analyzing sentiment: {e}")
 
 
 @receiver(post_save, sender=Conversation)
@@ -52,10 +56,10 @@ def check_escalation_needed(sender, instance, **kwargs):
                 ).distinct()
 
                 # Send notification (implement your notification system)
-                print(f"Escalation needed for conversation {instance.session_id}")
+                logger.info(f"Escalation needed for conversation {instance.session_id}")
 
         except Exception as e:
-            print(f"Error checking escalation: {e}")
+            logger.exception(f"Error checking escalation: {e}")
 
 
 def update_conversation_sentiment(conversation):
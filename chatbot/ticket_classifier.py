@@ -103,6 +103,7 @@ class TicketClassifier:
                     n_estimators=120,
                     max_depth=24,
                     random_state=42,
+                    n_jobs=-1,
                 )
                 logger.info("Initialized new TF‑IDF + RandomForest classifier (untrained).")
         except Exception as exc:
@@ -235,6 +236,56 @@ class TicketClassifier:
                 "error": str(exc),
             }
 
+    def classify_batch(self, items: List[Tuple[str, str]]) -> List[Dict]:
+        """
+        Classify many tickets in one call.
+
+        `items` is a list of (title, description) pairs. The category
+        model runs once over the whole list — the zero-shot pipeline
+        batches texts through the transformer and TF‑IDF transforms the
+        full matrix in one pass — which is where batch inference pays
+        off; priority/tag extraction is rule-based and cheap per item.
+        Output dicts match classify_ticket.
+        """
+        texts = [f"{title}. {description}" for title, description in items]
+        cat_results = self._classify_category_batch(texts)
+
+        results: List[Dict] = []
+        for (title, description), cat_result in zip(items, cat_results):
+            try:
+                pri_result = self._classify_priority(title, description, {})
+                text = f"{title}. {description}"
+                tags = self._extract_tags(text)
+                eta = self._estimate_resolution_time(
+                    cat_result["category"], pri_result["priority"]
+                )
+                team = self._suggest_team(cat_result["category"])
+
+                results.append({
+                    "category": cat_result["category"],
+                    "category_confidence": float(cat_result["confidence"]),
+                    "priority": pri_result["priority"],
+                    "priority_confidence": float(pri_result["confidence"]),
+                    "tags": tags,
+                    "estimated_resolution_time": eta,
+                    "suggested_team": team,
+                    "top_categories": cat_result.get("top_predictions", []),
+                    "classification_method": cat_result.get("method", "rules"),
+                })
+            except Exception as exc:
+                logger.error("Batch ticket classification failed: %s", exc)
+                results.append({
+                    "category": "General Support",
+                    "category_confidence": 0.5,
+                    "priority": "medium",
+                    "priority_confidence": 0.5,
+                    "tags": [],
+                    "estimated_resolution_time": "2-3 business days",
+                    "suggested_team": "general",
+                    "error": str(exc),
+                })
+        return results
+
     # ------------------------------------------------------------------
     # Category classification
     # ------------------------------------------------------------------
@@ -253,6 +304,57 @@ class TicketClassifier:
 
         return self._classify_with_rules(text)
 
+    def _classify_category_batch(self, texts: List[str]) -> List[Dict]:
+        """Category classification for a list of texts in one model call."""
+        if self.bert_classifier:
+            try:
+                outputs = self.bert_classifier(
+                    texts,
+                    candidate_labels=self.categories,
+                    multi_label=False,
+                    batch_size=8,
+                )
+                return [
+                    {
+                        "category": out["labels"][0],
+                        "confidence": float(out["scores"][0]),
+                        "method": "bert",
+                        "top_predictions": [
+                            {"category": lbl, "confidence": float(score)}
+                            for lbl, score in zip(out["labels"][:3], out["scores"][:3])
+                        ],
+                    }
+                    for out in outputs
+                ]
+            except Exception as exc:
+                logger.error("Batch BERT classification error: %s", exc)
+
+        if self.traditional_model and self.vectorizer:
+            try:
+                X = self.vectorizer.transform(texts)
+                probs = self.traditional_model.predict_proba(X)
+                results = []
+                for row in probs:
+                    idx = int(np.argmax(row))
+                    top_idx = np.argsort(row)[-3:][::-1]
+                    results.append({
+                        "category": self.traditional_model.classes_[idx],
+                        "confidence": float(row[idx]),
+                        "method": "traditional",
+                        "top_predictions": [
+                            {
+                                "category": self.traditional_model.classes_[i],
+                                "confidence": float(row[i]),
+                            }
+                            for i in top_idx
+                        ],
+                    })
+                return results
+            except Exception as exc:
+                logger.error("Batch traditional classification error: %s", exc)
+
+        return [self._classify_with_rules(text) for text in texts]
+
     def _classify_with_bert(self, text: str) -> Dict:
         """Zero-shot classification using BART‑MNLI over dynamic label set."""
         try:
@@ -669,14 +771,16 @@ class TicketClassifier:
             Ticket.objects.exclude(category__isnull=True)
             .exclude(category="")
             .filter(ai_confidence__gte=0.7)
-            .order_by("-created_at")[:max_samples]
+            .order_by("-created_at")
+            .values_list("title", "description", "category")[:max_samples]
         )
 
-        data: List[Tuple[str, str]] = []
-        for t in qs:
-            txt = f"{t.title}. {t.description}"
-            data.append((txt, t.category))
-        return data
+        # Stream rows on a server-side cursor instead of materializing
+        # the whole sample set at once
+        return [
+            (f"{title}. {description}", category)
+            for title, description, category in qs.iterator(chunk_size=500)
+        ]
 
 # Singleton instance used across the project
 ticket_classifier = TicketClassifier()
\ No newline at end of file
@@ -13,6 +13,21 @@ from .serializers import (
 # from .ai_engine import chatbot_engine
 # from .sentiment_analyzer import sentiment_analyzer
 
+# Keyword sets used by the basic sentiment/response helpers, built once at
+# import instead of per call.
+POSITIVE_WORDS = frozenset([
+    'good', 'great', 'excellent', 'amazing', 'wonderful', 'perfect',
+    'love', 'like', 'happy', 'pleased',
+])
+NEGATIVE_WORDS = frozenset([
+    'bad', 'terrible', 'awful', 'horrible', 'hate', 'dislike',
+    'angry', 'frustrated', 'annoyed', 'problem',
+])
+GREETING_KEYWORDS = ('hello', 'hi', 'hey', 'good morning', 'good afternoon', 'good evening')
+ORDER_KEYWORDS = ('order', 'tracking', 'shipment', 'delivery', 'package')
+BILLING_KEYWORDS = ('bill', 'payment', 'charge', 'invoice', 'refund', 'credit')
+TECH_KEYWORDS = ('error', 'bug', 'issue', 'problem', 'broken', 'not working', 'help')
+
 
 class ChatbotViewSet(viewsets.ViewSet):
     """Chatbot API endpoints"""
@@ -45,12 +60,15 @@ class ChatbotViewSet(viewsets.ViewSet):
 
         # TODO: Re-enable sentiment analysis when AI engine is ready
         # For now, use basic sentiment detection
-        user_message.sentiment = self._detect_basic_sentiment(message_text)
-        user_message.sentiment_score = self._calculate_sentiment_score(message_text)
+        # Lowercase once and share across the sentiment + response
+        # helpers instead of copying the string in each of them.
+        message_lower = message_text.lower()
+        user_message.sentiment = self._detect_basic_sentiment(message_lower)
+        user_message.sentiment_score = self._calculate_sentiment_score(message_lower)
         user_message.save()
 
         # Generate basic AI-like response
-        ai_response = self._generate_basic_response(message_text, conversation)
+        ai_response = self._generate_basic_response(message_lower, conversation)
         
         # TODO: Re-enable advanced AI when ready
         # ai_response = chatbot_engine.generate_response(
@@ -110,14 +128,10 @@ class ChatbotViewSet(viewsets.ViewSet):
 
             conversation.save()
 
-    def _detect_basic_sentiment(self, message_text):
+    def _detect_basic_sentiment(self, message_lower):
         """Basic sentiment detection without AI"""
-        message_lower = message_text.lower()
-        positive_words = ['good', 'great', 'excellent', 'amazing', 'wonderful', 'perfect', 'love', 'like', 'happy', 'pleased']
-        negative_words = ['bad', 'terrible', 'awful', 'horrible', 'hate', 'dislike', 'angry', 'frustrated', 'annoyed', 'problem']
-        
-        positive_count = sum(1 for word in positive_words if word in message_lower)
-        negative_count = sum(1 for word in negative_words if word in message_lower)
+        positive_count = sum(1 for word in POSITIVE_WORDS if word in message_lower)
+        negative_count = sum(1 for word in NEGATIVE_WORDS if word in message_lower)
         
         if positive_count > negative_count:
             return 'positive'
@@ -126,14 +140,10 @@ class ChatbotViewSet(viewsets.ViewSet):
         else:
             return 'neutral'
 
-    def _calculate_sentiment_score(self, message_text):
+    def _calculate_sentiment_score(self, message_lower):
         """Calculate basic sentiment score"""
-        message_lower = message_text.lower()
-        positive_words = ['good', 'great', 'excellent', 'amazing', 'wonderful', 'perfect', 'love', 'like', 'happy', 'pleased']
-        negative_words = ['bad', 'terrible', 'awful', 'horrible', 'hate', 'dislike', 'angry', 'frustrated', 'annoyed', 'problem']
-        
-        positive_count = sum(1 for word in positive_words if word in message_lower)
-        negative_count = sum(1 for word in negative_words if word in message_lower)
+        positive_count = sum(1 for word in POSITIVE_WORDS if word in message_lower)
+        negative_count = sum(1 for word in NEGATIVE_WORDS if word in message_lower)
         
         # Simple scoring: -1 to 1 range
         total_emotional_words = positive_count + negative_count
@@ -143,13 +153,11 @@ class ChatbotViewSet(viewsets.ViewSet):
         score = (positive_count - negative_count) / total_emotional_words
         return round(score, 2)
 
-    def _generate_basic_response(self, message_text, conversation):
+    def _generate_basic_response(self, message_lower, conversation):
         """Generate basic contextual responses"""
-        message_lower = message_text.lower()
         
         # Greeting responses
-        greetings = ['hello', 'hi', 'hey', 'good morning', 'good afternoon', 'good evening']
-        if any(greeting in message_lower for greeting in greetings):
+        if any(greeting in message_lower for greeting in GREETING_KEYWORDS):
             return {
                 'response': "Hello! I'm your AI support assistant. How can I help you today?",
                 'intent': 'greeting',
@@ -159,8 +167,7 @@ class ChatbotViewSet(viewsets.ViewSet):
             }
         
         # Order tracking
-        order_keywords = ['order', 'tracking', 'shipment', 'delivery', 'package']
-        if any(keyword in message_lower for keyword in order_keywords):
+        if any(keyword in message_lower for keyword in ORDER_KEYWORDS):
             return {
                 'response': "I'd be happy to help you track your order. Could you please provide your order number?",
                 'intent': 'order_tracking',
@@ -170,8 +177,7 @@ class ChatbotViewSet(viewsets.ViewSet):
             }
         
         # Billing questions
-        billing_keywords = ['bill', 'payment', 'charge', 'invoice', 'refund', 'credit']
-        if any(keyword in message_lower for keyword in billing_keywords):
+        if any(keyword in message_lower for keyword in BILLING_KEYWORDS):
             return {
                 'response': "I can help with billing questions. What specific billing issue are you experiencing?",
                 'intent': 'billing_inquiry',
@@ -181,8 +187,7 @@ class ChatbotViewSet(viewsets.ViewSet):
             }
         
         # Technical support
-        tech_keywords = ['error', 'bug', 'issue', 'problem', 'broken', 'not working', 'help']
-        if any(keyword in message_lower for keyword in tech_keywords):
+        if any(keyword in message_lower for keyword in TECH_KEYWORDS):
             return {
                 'response': "I understand you're experiencing a technical issue. Can you describe the problem you're facing?",
                 'intent': 'technical_support',
@@ -207,21 +212,23 @@ class ChatbotViewSet(viewsets.ViewSet):
         rating = request.data.get('rating')
         feedback = request.data.get('feedback', '')
 
-        try:
-            conversation = Conversation.objects.get(session_id=session_id)
-            conversation.is_active = False
-            conversation.ended_at = timezone.now()
-            conversation.customer_rating = rating
-            conversation.customer_feedback = feedback
-            conversation.save()
+        # Single UPDATE touching only the 4 changed columns instead of a
+        # SELECT + full-row save round trip.
+        updated = Conversation.objects.filter(session_id=session_id).update(
+            is_active=False,
+            ended_at=timezone.now(),
+            customer_rating=rating,
+            customer_feedback=feedback
+        )
 
-            return Response({'status': 'conversation ended'})
-        except Conversation.DoesNotExist:
+        if not updated:
             return Response(
                 {'error': 'Conversation not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
+        return Response({'status': 'conversation ended'})
+
 
 class ConversationViewSet(viewsets.ReadOnlyModelViewSet):
     """Conversation management API"""
@@ -36,6 +36,12 @@ app.conf.beat_schedule = {
         'schedule': crontab(hour='*/6', minute=0),
     },
 
+    # Batch-classify tickets that slipped past per-ticket classification
+    'classify-pending-tickets': {
+        'task': 'tickets.tasks.classify_pending_tickets',
+        'schedule': crontab(minute='*/2'),
+    },
+
     # Check for alerts every 15 minutes
     'check-for-alerts': {
         'task': 'analytics.tasks.check_for_alerts',
@@ -46,15 +52,27 @@ app.conf.beat_schedule = {
     'cleanup-old-data': {
         'task': 'config.tasks.cleanup_old_data',
         'schedule': crontab(day_of_week=0, hour=2, minute=0),
+        'options': {'queue': 'batch'},
     },
 
     # Train ML models weekly (Sunday at 3 AM)
     'train-ml-models': {
         'task': 'config.tasks.train_ml_models',
         'schedule': crontab(day_of_week=0, hour=3, minute=0),
+        'options': {'queue': 'batch'},
     },
 }
 
+# Route long-running maintenance work onto a dedicated 'batch' queue so a
+# Sunday training/cleanup run can't starve interactive tasks on the
+# default queue (serve it with: celery -A config worker -Q batch
+# --concurrency=1 --prefetch-multiplier=1).
+app.conf.task_routes = {
+    'config.tasks.cleanup_old_data': {'queue': 'batch'},
+    'config.tasks.train_ml_models': {'queue': 'batch'},
+    'config.tasks.backup_database': {'queue': 'batch'},
+}
+
 # Celery configuration
 app.conf.update(
     task_serializer='json',
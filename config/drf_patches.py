@@ -0,0 +1,41 @@
+"""
+DRF performance patches
+
+ModelSerializer.get_fields rebuilds the whole field map by introspecting
+the model on every serializer instantiation — a measurable slice of
+request CPU on list endpoints that construct thousands of serializers.
+The field map is identical per serializer class, so it is built once and
+copied per instance here. Applied from an AppConfig.ready() hook.
+"""
+
+import copy
+import logging
+
+logger = logging.getLogger(__name__)
+
+_fields_cache = {}
+_original_get_fields = None
+
+
+def apply():
+    """Install the cached get_fields on ModelSerializer (idempotent)"""
+    global _original_get_fields
+    if _original_get_fields is not None:
+        return
+
+    from rest_framework import serializers
+
+    _original_get_fields = serializers.ModelSerializer.get_fields
+
+    def cached_get_fields(self):
+        cls = self.__class__
+        fields = _fields_cache.get(cls)
+        if fields is None:
+            fields = _original_get_fields(self)
+            _fields_cache[cls] = fields
+        # Copies are handed out because binding mutates each Field
+        # (field_name/parent), so cached instances must stay pristine
+        return {name: copy.deepcopy(field) for name, field in fields.items()}
+
+    serializers.ModelSerializer.get_fields = cached_get_fields
+    logger.debug("ModelSerializer.get_fields caching enabled")
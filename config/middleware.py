@@ -1,36 +1,118 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
 from django.http import JsonResponse
+import atexit
 import logging
+import logging.handlers
+import queue
 
 logger = logging.getLogger(__name__)
 
 
+def _setup_queue_logging():
+    """
+    Route request logging through a QueueHandler so the actual write
+    (console/file I/O) happens on a background QueueListener thread
+    instead of blocking the request path.
+    """
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(
+        log_queue, *logger.handlers or logging.getLogger().handlers,
+        respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+    logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    logger.propagate = False
+
+
+_setup_queue_logging()
+
+
 class RequestLoggingMiddleware(MiddlewareMixin):
     """Log all requests for monitoring"""
 
     def process_request(self, request):
-        logger.info(
-            f"{request.method} {request.path} "
-            f"from {request.META.get('REMOTE_ADDR')}"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "%s %s from %s",
+                request.method, request.path, request.META.get('REMOTE_ADDR')
+            )
         return None
 
 
-class APIVersionMiddleware(MiddlewareMixin):
+_API_VERSION = '1.0.0'
+
+
+class APIVersionMiddleware:
     """Add API version to response headers"""
 
-    def process_response(self, request, response):
-        if request.path.startswith('/api/'):
-            response['X-API-Version'] = '1.0.0'
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        # path_info avoids re-decoding SCRIPT_NAME + PATH_INFO; non-API
+        # traffic (static assets, admin, swagger) early-returns untouched.
+        if request.path_info.startswith('/api/'):
+            response['X-API-Version'] = _API_VERSION
         return response
 
 
+_TENANT_CACHE_KEY = 'tenant:{}'
+_TENANT_CACHE_TTL = 60 * 60 * 24
+_NO_TENANT = 0  # cached sentinel so users without a tenant don't re-query
+
+
+def _user_tenant_id(user):
+    """Resolve user -> tenant_id through the cache, hitting the DB only on
+    a cold cache. Invalidated by the TenantUser signals below."""
+    key = _TENANT_CACHE_KEY.format(user.id)
+    tenant_id = cache.get(key)
+    if tenant_id is None:
+        from tenants.models import TenantUser
+        tenant_id = (
+            TenantUser.objects.filter(user=user)
+            .values_list('tenant_id', flat=True)
+            .first()
+        ) or _NO_TENANT
+        cache.set(key, tenant_id, _TENANT_CACHE_TTL)
+    return tenant_id or None
+
+
+def _invalidate_tenant_cache(sender, instance, **kwargs):
+    cache.delete(_TENANT_CACHE_KEY.format(instance.user_id))
+
+
 class TenantContextMiddleware(MiddlewareMixin):
     """Add tenant context to requests"""
 
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        from tenants.models import TenantUser
+        post_save.connect(_invalidate_tenant_cache, sender=TenantUser)
+        post_delete.connect(_invalidate_tenant_cache, sender=TenantUser)
+
     def process_request(self, request):
-        if hasattr(request.user, 'tenantuser'):
-            request.tenant = request.user.tenantuser.tenant
+        # The previous hasattr() chase cost two queries per authenticated
+        # request (reverse one-to-one + tenant FK). Resolve just the
+        # tenant_id through the cache and lazy-load the full Tenant only
+        # if something actually dereferences request.tenant.
+        user = request.user
+        if user.is_authenticated:
+            tenant_id = _user_tenant_id(user)
         else:
+            tenant_id = None
+
+        request.tenant_id = tenant_id
+        if tenant_id is None:
             request.tenant = None
+        else:
+            from tenants.models import Tenant
+            request.tenant = SimpleLazyObject(
+                lambda: Tenant.objects.filter(pk=tenant_id).first()
+            )
         return None
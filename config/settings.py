@@ -115,6 +115,9 @@ if DEBUG:
         'allauth.account.middleware.AccountMiddleware',
         'django.contrib.messages.middleware.MessageMiddleware',
         'django.middleware.clickjacking.XFrameOptionsMiddleware',
+        # Last so its short-circuited responses still pass back through
+        # the message and clickjacking middleware above
+        'dashboard.middleware.StaticRouteMiddleware',
     ]
 else:
     # Multi-tenant middleware for production
@@ -130,6 +133,9 @@ else:
         'allauth.account.middleware.AccountMiddleware',
         'django.contrib.messages.middleware.MessageMiddleware',
         'django.middleware.clickjacking.XFrameOptionsMiddleware',
+        # Last so its short-circuited responses still pass back through
+        # the message and clickjacking middleware above
+        'dashboard.middleware.StaticRouteMiddleware',
     ]
 
 ROOT_URLCONF = 'config.urls'
@@ -216,6 +222,10 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'config.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': (
@@ -234,6 +244,14 @@ REST_FRAMEWORK = {
     }
 }
 
+# API Schema (drf-spectacular)
+SPECTACULAR_SETTINGS = {
+    'TITLE': 'AI Customer Support API',
+    'VERSION': '1.0.0',
+    'SCHEMA_PATH_PREFIX': '/api/',
+    'SERVE_INCLUDE_SCHEMA': False,
+}
+
 # JWT Configuration
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
@@ -260,6 +278,8 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
+# Keep the pipelined broker connection warm for batched group() publishes
+CELERY_BROKER_TRANSPORT_OPTIONS = {'socket_keepalive': True}
 
 # Channels Configuration
 CHANNEL_LAYERS = {
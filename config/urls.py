@@ -2,36 +2,45 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from django.views.decorators.cache import cache_page
 from django.views.generic import TemplateView
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
-from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
-    TokenRefreshView,
-)
+from rest_framework_simplejwt.views import TokenRefreshView
+from tenants.jwt import TenantTokenObtainPairView
 from config.views import CustomLoginView
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def tpl(template_name):
+    """Build (and cache) a TemplateView callable per template name so
+    repeated imports/reloads reuse one view instead of allocating a new
+    closure for every static page."""
+    return TemplateView.as_view(template_name=template_name)
+
 
 urlpatterns = [
     # Admin
     path('admin/', admin.site.urls),
 
     # Frontend Pages
-    path('', TemplateView.as_view(template_name='index.html'), name='home'),
-    path('features/', TemplateView.as_view(template_name='features.html'), name='features'),
-    path('pricing/', TemplateView.as_view(template_name='pricing.html'), name='pricing'),
-    path('about/', TemplateView.as_view(template_name='about.html'), name='about'),
-    path('contact/', TemplateView.as_view(template_name='contact.html'), name='contact'),
+    path('', tpl('index.html'), name='home'),
+    path('features/', tpl('features.html'), name='features'),
+    path('pricing/', tpl('pricing.html'), name='pricing'),
+    path('about/', tpl('about.html'), name='about'),
+    path('contact/', tpl('contact.html'), name='contact'),
 
     # Authentication
     path('accounts/', include('allauth.urls')),
-    path('register/', TemplateView.as_view(template_name='auth/register.html'), name='register'),
+    path('register/', tpl('auth/register.html'), name='register'),
     path('auth/login/', CustomLoginView.as_view(), name='login'),
-    path('auth/logout/', TemplateView.as_view(template_name='auth/logout.html'), name='logout'),
-    path('auth/password_change/', TemplateView.as_view(template_name='auth/password_change.html'), name='password_change'),
-    path('auth/password_change/done/', TemplateView.as_view(template_name='auth/password_change_done.html'), name='password_change_done'),
-    path('auth/password_reset/', TemplateView.as_view(template_name='auth/password_reset.html'), name='password_reset'),
-    path('auth/password_reset/done/', TemplateView.as_view(template_name='auth/password_reset_done.html'), name='password_reset_done'),
-    path('auth/reset/<uidb64>/<token>/', TemplateView.as_view(template_name='auth/password_reset_confirm.html'), name='password_reset_confirm'),
-    path('auth/reset/done/', TemplateView.as_view(template_name='auth/password_reset_complete.html'), name='password_reset_complete'),
+    path('auth/logout/', tpl('auth/logout.html'), name='logout'),
+    path('auth/password_change/', tpl('auth/password_change.html'), name='password_change'),
+    path('auth/password_change/done/', tpl('auth/password_change_done.html'), name='password_change_done'),
+    path('auth/password_reset/', tpl('auth/password_reset.html'), name='password_reset'),
+    path('auth/password_reset/done/', tpl('auth/password_reset_done.html'), name='password_reset_done'),
+    path('auth/reset/<uidb64>/<token>/', tpl('auth/password_reset_confirm.html'), name='password_reset_confirm'),
+    path('auth/reset/done/', tpl('auth/password_reset_complete.html'), name='password_reset_complete'),
 
     # Dashboard
     path('dashboard/', include('dashboard.urls', namespace='dashboard')),
@@ -42,26 +51,33 @@ urlpatterns = [
     path('api/tickets/', include('tickets.urls')),
     path('api/analytics/', include('analytics.urls')),
 
-    # API Documentation
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
+    # API Documentation (schema generation introspects every viewset and
+    # serializer, so cache the rendered result instead of rebuilding it
+    # on each request)
+    path('api/schema/', cache_page(60 * 60)(SpectacularAPIView.as_view()), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
 
     # JWT Authentication
-    path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('api/token/', TenantTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
 ]
 
-# Serve static and media files in development
+# Serve static and media files in development only. In production these
+# prefixes must never reach Django: whitenoise handles /static/ from the
+# gunicorn process and deploy/nginx.conf serves both /static/ and /media/
+# straight from disk, so every asset request skips Python entirely.
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.BASE_DIR / 'static')
 
-    # Debug toolbar
-    import debug_toolbar
-
-    urlpatterns = [
-                      path('__debug__/', include(debug_toolbar.urls)),
-                  ] + urlpatterns
+    # Debug toolbar — optional, and inserted in place rather than
+    # rebuilding the whole urlpatterns list on every autoreload.
+    try:
+        import debug_toolbar
+    except ImportError:
+        pass
+    else:
+        urlpatterns.insert(0, path('__debug__/', include(debug_toolbar.urls)))
 
 # Custom error handlers
 handler404 = 'config.views.handler404'
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db import transaction
 from .models import (
     DashboardWidget, UserDashboardPreference, SavedFilter,
     QuickAction, DashboardNote
@@ -28,6 +29,12 @@ class DashboardWidgetAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        # Keep the config/roles JSON blobs out of the changelist SELECT.
+        return super().get_queryset(request).only(
+            'id', 'name', 'widget_type', 'size', 'position', 'is_active'
+        )
+
 
 @admin.register(UserDashboardPreference)
 class UserDashboardPreferenceAdmin(admin.ModelAdmin):
@@ -35,6 +42,7 @@ class UserDashboardPreferenceAdmin(admin.ModelAdmin):
         'user', 'layout', 'theme', 'default_view',
         'auto_refresh', 'refresh_interval'
     ]
+    list_select_related = ['user']
     list_filter = ['layout', 'theme', 'default_view', 'auto_refresh']
     search_fields = ['user__username', 'user__email']
     readonly_fields = ['created_at', 'updated_at']
@@ -71,35 +79,55 @@ class SavedFilterAdmin(admin.ModelAdmin):
         'name', 'user', 'filter_type', 'is_shared',
         'is_default', 'usage_count', 'last_used'
     ]
+    list_select_related = ['user']
     list_filter = ['filter_type', 'is_shared', 'is_default']
     search_fields = ['name', 'description', 'user__username']
     readonly_fields = ['usage_count', 'last_used', 'created_at', 'updated_at']
 
     actions = ['make_shared', 'make_private', 'set_as_default']
 
+    def get_queryset(self, request):
+        # The filters JSONField can be large and the changelist never
+        # shows it; fetch only the displayed columns.
+        return super().get_queryset(request).select_related('user').only(
+            'id', 'name', 'user__id', 'user__username', 'filter_type',
+            'is_shared', 'is_default', 'usage_count', 'last_used'
+        )
+
     def make_shared(self, request, queryset):
-        queryset.update(is_shared=True)
-        self.message_user(request, f"{queryset.count()} filters marked as shared")
+        updated = queryset.update(is_shared=True)
+        self.message_user(request, f"{updated} filters marked as shared")
 
     make_shared.short_description = "Mark selected filters as shared"
 
     def make_private(self, request, queryset):
-        queryset.update(is_shared=False)
-        self.message_user(request, f"{queryset.count()} filters marked as private")
+        updated = queryset.update(is_shared=False)
+        self.message_user(request, f"{updated} filters marked as private")
 
     make_private.short_description = "Mark selected filters as private"
 
     def set_as_default(self, request, queryset):
-        if queryset.count() > 1:
+        # LIMIT 2 on the pk column answers "more than one selected?"
+        # without a full COUNT(*) over the selection
+        if len(queryset.order_by().values_list('pk', flat=True)[:2]) > 1:
             self.message_user(request, "Please select only one filter to set as default", level='error')
         else:
-            filter_obj = queryset.first()
-            SavedFilter.objects.filter(
-                user=filter_obj.user,
-                filter_type=filter_obj.filter_type
-            ).update(is_default=False)
-            queryset.update(is_default=True)
-            self.message_user(request, f"{filter_obj.name} set as default")
+            # Pull only the columns the action needs instead of hydrating
+            # the full SavedFilter row.
+            user_id, filter_type, pk, name = queryset.values_list(
+                'user_id', 'filter_type', 'pk', 'name'
+            ).first()
+            with transaction.atomic():
+                # Clear the old default with a predicate that excludes the
+                # target row, then flag the target: one narrow UPDATE plus
+                # one single-row UPDATE, both inside a transaction so a
+                # crash can't leave the user without any default.
+                SavedFilter.objects.filter(
+                    user_id=user_id,
+                    filter_type=filter_type
+                ).exclude(pk=pk).update(is_default=False)
+                SavedFilter.objects.filter(pk=pk).update(is_default=True)
+            self.message_user(request, f"{name} set as default")
 
     set_as_default.short_description = "Set as default filter"
 
@@ -134,26 +162,34 @@ class DashboardNoteAdmin(admin.ModelAdmin):
         'title', 'user', 'color', 'is_pinned',
         'is_archived', 'reminder_date', 'created_at'
     ]
+    list_select_related = ['user']
     list_filter = ['color', 'is_pinned', 'is_archived', 'created_at']
     search_fields = ['title', 'content', 'user__username']
     readonly_fields = ['created_at', 'updated_at']
 
     actions = ['pin_notes', 'unpin_notes', 'archive_notes']
 
+    def get_queryset(self, request):
+        # Exclude the note body (TextField) from the changelist SELECT.
+        return super().get_queryset(request).select_related('user').only(
+            'id', 'title', 'user__id', 'user__username', 'color',
+            'is_pinned', 'is_archived', 'reminder_date', 'created_at'
+        )
+
     def pin_notes(self, request, queryset):
-        queryset.update(is_pinned=True)
-        self.message_user(request, f"{queryset.count()} notes pinned")
+        updated = queryset.update(is_pinned=True)
+        self.message_user(request, f"{updated} notes pinned")
 
     pin_notes.short_description = "Pin selected notes"
 
     def unpin_notes(self, request, queryset):
-        queryset.update(is_pinned=False)
-        self.message_user(request, f"{queryset.count()} notes unpinned")
+        updated = queryset.update(is_pinned=False)
+        self.message_user(request, f"{updated} notes unpinned")
 
     unpin_notes.short_description = "Unpin selected notes"
 
     def archive_notes(self, request, queryset):
-        queryset.update(is_archived=True)
-        self.message_user(request, f"{queryset.count()} notes archived")
+        updated = queryset.update(is_archived=True)
+        self.message_user(request, f"{updated} notes archived")
 
     archive_notes.short_description = "Archive selected notes"
@@ -0,0 +1,55 @@
+from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_cookie
+from django.views.generic import TemplateView
+
+
+class StaticRouteMiddleware:
+    """
+    O(1) dispatch for the exact-match frontend/auth template routes.
+
+    Django's URLResolver walks urlpatterns linearly on every request;
+    these ~12 routes are literal strings, so a dict lookup resolves them
+    without touching the resolver at all. The table is built once at
+    server start.
+
+    Must be registered after AuthenticationMiddleware: the shared navbar
+    template reads user.is_authenticated through the auth context
+    processor.
+    """
+
+    _TEMPLATE_ROUTES = {
+        '/': 'index.html',
+        '/features/': 'features.html',
+        '/pricing/': 'pricing.html',
+        '/about/': 'about.html',
+        '/contact/': 'contact.html',
+        '/register/': 'auth/register.html',
+        '/auth/logout/': 'auth/logout.html',
+        '/auth/password_change/': 'auth/password_change.html',
+        '/auth/password_change/done/': 'auth/password_change_done.html',
+        '/auth/password_reset/': 'auth/password_reset.html',
+        '/auth/password_reset/done/': 'auth/password_reset_done.html',
+        '/auth/reset/done/': 'auth/password_reset_complete.html',
+    }
+
+    # Static marketing pages whose rendered HTML can be cached whole.
+    # Varies on cookie so the navbar's logged-in state stays per-session;
+    # /contact/ is excluded because it renders a CSRF form.
+    _CACHED_ROUTES = frozenset(['/', '/features/', '/pricing/', '/about/'])
+    _CACHE_TIMEOUT = 60 * 60
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.routes = {}
+        for route, template in self._TEMPLATE_ROUTES.items():
+            view = TemplateView.as_view(template_name=template)
+            if route in self._CACHED_ROUTES:
+                view = cache_page(self._CACHE_TIMEOUT)(vary_on_cookie(view))
+            self.routes[route] = view
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD'):
+            view = self.routes.get(request.path_info)
+            if view is not None:
+                return view(request)
+        return self.get_response(request)
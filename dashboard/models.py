@@ -1,5 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.utils import timezone
 import uuid
 
@@ -11,7 +13,10 @@ class DashboardWidget(models.Model):
     """
     Customizable dashboard widgets for different user roles
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # BigAutoField PK (project default) keeps B-tree inserts append-only
+    # and joins at 8 bytes; the UUID stays available for external-facing
+    # identifiers.
+    external_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
 
     name = models.CharField(max_length=100)
     widget_type = models.CharField(
@@ -39,8 +44,12 @@ class DashboardWidget(models.Model):
         default='medium'
     )
 
-    # Permissions
-    roles = models.JSONField(default=list, blank=True)  # ['admin', 'agent', etc.]
+    # Permissions. ArrayField + GIN index so per-role widget filtering
+    # (roles__contains=[role]) is index-accelerated instead of parsing
+    # JSON per row.
+    roles = ArrayField(
+        models.CharField(max_length=20), default=list, blank=True
+    )  # ['admin', 'agent', etc.]
 
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -48,6 +57,12 @@ class DashboardWidget(models.Model):
 
     class Meta:
         ordering = ['position']
+        indexes = [
+            # Dashboard renders filter on is_active and sort by position;
+            # the composite index hands rows back pre-sorted.
+            models.Index(fields=['is_active', 'position']),
+            GinIndex(fields=['roles']),
+        ]
 
     def __str__(self):
         return self.name
@@ -57,7 +72,10 @@ class UserDashboardPreference(models.Model):
     """
     User-specific dashboard preferences and customization
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # BigAutoField PK (project default) keeps B-tree inserts append-only
+    # and joins at 8 bytes; the UUID stays available for external-facing
+    # identifiers.
+    external_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='dashboard_preference')
 
     # Layout preferences
@@ -125,7 +143,10 @@ class SavedFilter(models.Model):
     """
     User-saved filters for tickets and conversations
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # BigAutoField PK (project default) keeps B-tree inserts append-only
+    # and joins at 8 bytes; the UUID stays available for external-facing
+    # identifiers.
+    external_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='saved_filters')
 
     name = models.CharField(max_length=100)
@@ -156,6 +177,13 @@ class SavedFilter(models.Model):
 
     class Meta:
         ordering = ['-usage_count', 'name']
+        indexes = [
+            # Backs the default-filter swap in the admin action and any
+            # "current default for this user/type" lookup.
+            models.Index(fields=['user', 'filter_type', 'is_default']),
+            # Matches the per-user filter lists ordered by popularity.
+            models.Index(fields=['user', 'filter_type', '-usage_count']),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.user.username})"
@@ -165,7 +193,10 @@ class QuickAction(models.Model):
     """
     Quick action shortcuts for common tasks
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # BigAutoField PK (project default) keeps B-tree inserts append-only
+    # and joins at 8 bytes; the UUID stays available for external-facing
+    # identifiers.
+    external_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
 
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
@@ -205,6 +236,9 @@ class QuickAction(models.Model):
 
     class Meta:
         ordering = ['position', 'name']
+        indexes = [
+            models.Index(fields=['is_active', 'required_role', 'position']),
+        ]
 
     def __str__(self):
         return self.name
@@ -214,7 +248,10 @@ class DashboardNote(models.Model):
     """
     Personal notes and reminders on dashboard
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # BigAutoField PK (project default) keeps B-tree inserts append-only
+    # and joins at 8 bytes; the UUID stays available for external-facing
+    # identifiers.
+    external_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='dashboard_notes')
 
     title = models.CharField(max_length=200)
@@ -242,6 +279,11 @@ class DashboardNote(models.Model):
 
     class Meta:
         ordering = ['-is_pinned', '-created_at']
+        indexes = [
+            # Per-user note lists: active vs archived, pinned first,
+            # newest first — the index order mirrors the query order.
+            models.Index(fields=['user', 'is_archived', '-is_pinned', '-created_at']),
+        ]
 
     def __str__(self):
         return self.title
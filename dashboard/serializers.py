@@ -22,6 +22,12 @@ class UserDashboardPreferenceSerializer(serializers.ModelSerializer):
     """User dashboard preference serializer"""
     username = serializers.CharField(source='user.username', read_only=True)
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Apply to the view queryset before listing: the username field
+        traverses the one-to-one to User, which N+1s without this JOIN."""
+        return queryset.select_related('user')
+
     class Meta:
         model = UserDashboardPreference
         fields = [
@@ -37,7 +43,26 @@ class UserDashboardPreferenceSerializer(serializers.ModelSerializer):
 
 class SavedFilterSerializer(serializers.ModelSerializer):
     """Saved filter serializer"""
-    user_name = serializers.CharField(source='user.get_full_name', read_only=True)
+    user_name = serializers.SerializerMethodField()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Annotate the user's full name in SQL so listing doesn't
+        hydrate a User object (and call get_full_name) per row."""
+        from django.db.models import CharField, Value
+        from django.db.models.functions import Concat
+        return queryset.annotate(
+            _full_name=Concat(
+                'user__first_name', Value(' '), 'user__last_name',
+                output_field=CharField()
+            )
+        )
+
+    def get_user_name(self, obj):
+        full_name = getattr(obj, '_full_name', None)
+        if full_name is not None:
+            return full_name.strip()
+        return obj.user.get_full_name()
 
     class Meta:
         model = SavedFilter
@@ -49,9 +74,8 @@ class SavedFilterSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'usage_count', 'last_used', 'created_at', 'updated_at']
 
     def create(self, validated_data):
-        """Increment usage count on creation"""
-        validated_data['usage_count'] = 1
-        return super().create(validated_data)
+        """Start the usage count at 1 with a single INSERT"""
+        return SavedFilter.objects.create(**validated_data, usage_count=1)
 
 
 class QuickActionSerializer(serializers.ModelSerializer):
@@ -69,6 +93,21 @@ class QuickActionSerializer(serializers.ModelSerializer):
 class DashboardNoteSerializer(serializers.ModelSerializer):
     """Dashboard note serializer"""
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Pull the owning user and their saved filters in one pass with
+        the minimal column set — user_id in only() is required for the
+        reverse-FK stitch to work."""
+        from django.db.models import Prefetch
+        return queryset.select_related('user').prefetch_related(
+            Prefetch(
+                'user__saved_filters',
+                queryset=SavedFilter.objects.only(
+                    'id', 'name', 'user_id', 'is_default'
+                ),
+            )
+        )
+
     class Meta:
         model = DashboardNote
         fields = [
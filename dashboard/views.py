@@ -5,65 +5,38 @@ from tickets.models import Ticket
 from chatbot.models import Conversation
 from tenants.models import TenantUser
 
-@login_required
-def dashboard_home(request):
-    """Dashboard home view"""
-    context = {
-        'page_title': 'Dashboard',
-        'active_page': 'dashboard'
-    }
-    return render(request, 'dashboard/dashboard.html', context)
 
-@login_required
-def tickets_view(request):
-    """Tickets management view"""
-    context = {
-        'page_title': 'Tickets',
-        'active_page': 'tickets'
-    }
-    return render(request, 'dashboard/tickets.html', context)
+def _template_view(template_name, page_title, active_page):
+    """Build a login-required view over a constant context dict.
 
-@login_required
-def analytics_view(request):
-    """Analytics dashboard view"""
-    context = {
-        'page_title': 'Analytics',
-        'active_page': 'analytics'
-    }
-    return render(request, 'dashboard/analytics.html', context)
+    The context never varies per request, so it is allocated once here
+    instead of inside every call.
+    """
+    context = {'page_title': page_title, 'active_page': active_page}
 
-@login_required
-def settings_view(request):
-    """Settings view"""
-    context = {
-        'page_title': 'Settings',
-        'active_page': 'settings'
-    }
-    return render(request, 'dashboard/settings.html', context)
+    @login_required
+    def view(request):
+        return render(request, template_name, context)
 
-@login_required
-def conversations_view(request):
-    """Conversations view"""
-    context = {
-        'page_title': 'Conversations',
-        'active_page': 'conversations'
-    }
-    return render(request, 'dashboard/conversations.html', context)
+    return view
 
-@login_required
-def knowledge_base_view(request):
-    """Knowledge base management view"""
-    context = {
-        'page_title': 'Knowledge Base',
-        'active_page': 'knowledge_base'
-    }
-    return render(request, 'dashboard/knowledge_base.html', context)
 
-@login_required
-def team_view(request):
-    """Team management view"""
-    context = {
-        'page_title': 'Team',
-        'active_page': 'team'
-    }
-    return render(request, 'dashboard/team.html', context)
+def stream_notes(queryset):
+    """Stream notes for exports/reports with bounded memory.
+
+    Evaluates the queryset once with a server-side cursor instead of
+    loading every row (don't call .all() inside the consuming loop), so
+    RSS stays flat regardless of row count.
+    """
+    return queryset.only(
+        'id', 'title', 'content', 'created_at'
+    ).iterator(chunk_size=2000)
+
+
+dashboard_home = _template_view('dashboard/dashboard.html', 'Dashboard', 'dashboard')
+tickets_view = _template_view('dashboard/tickets.html', 'Tickets', 'tickets')
+analytics_view = _template_view('dashboard/analytics.html', 'Analytics', 'analytics')
+settings_view = _template_view('dashboard/settings.html', 'Settings', 'settings')
+conversations_view = _template_view('dashboard/conversations.html', 'Conversations', 'conversations')
+knowledge_base_view = _template_view('dashboard/knowledge_base.html', 'Knowledge Base', 'knowledge_base')
+team_view = _template_view('dashboard/team.html', 'Team', 'team')
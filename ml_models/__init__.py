@@ -9,10 +9,6 @@ This package contains ML model implementations for:
 - Entity extraction
 """
 
-from .chatbot_model import ChatbotModel
-from .classifier_model import TicketClassifierModel
-from .sentiment_model import SentimentAnalysisModel
-
 __all__ = [
     'ChatbotModel',
     'TicketClassifierModel',
@@ -21,6 +17,26 @@ __all__ = [
 
 __version__ = '1.0.0'
 
+# The model classes pull in torch/transformers (seconds of import time,
+# hundreds of MB of RSS), so resolve them lazily via PEP 562 instead of
+# eagerly at package import. Workers that never touch ML stay light.
+_LAZY_IMPORTS = {
+    'ChatbotModel': '.chatbot_model',
+    'TicketClassifierModel': '.classifier_model',
+    'SentimentAnalysisModel': '.sentiment_model',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        obj = getattr(module, name)
+        globals()[name] = obj  # cache so subsequent lookups skip this hook
+        return obj
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # Model paths
 import os
 from pathlib import Path
@@ -28,10 +44,16 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parent
 MODEL_DIR = BASE_DIR / 'saved_models'
 
-# Ensure model directory exists
-MODEL_DIR.mkdir(exist_ok=True)
+# Ensure model directory exists (stat before mkdir saves a syscall on the
+# common already-exists path)
+if not MODEL_DIR.exists():
+    MODEL_DIR.mkdir(exist_ok=True)
+
+from types import MappingProxyType
 
-# Model configurations
+# Model configurations. Frozen (read-only views at both levels) so the
+# one canonical config can be shared everywhere without defensive
+# copies; **-unpacking still works on MappingProxyType.
 MODEL_CONFIG = {
     'chatbot': {
         'model_name': 'gpt2',
@@ -50,3 +72,6 @@ MODEL_CONFIG = {
         'max_length': 512,
     }
 }
+MODEL_CONFIG = MappingProxyType(
+    {key: MappingProxyType(value) for key, value in MODEL_CONFIG.items()}
+)
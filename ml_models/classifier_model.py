@@ -5,11 +5,13 @@ Multi-class classification for ticket categorization and priority detection
 
 import os
 import logging
+import functools
 import torch
+import torch.nn as nn
 import numpy as np
 from transformers import (
     BertForSequenceClassification,
-    BertTokenizer,
+    BertTokenizerFast,
     AutoModelForSequenceClassification,
     AutoTokenizer,
     Trainer,
@@ -22,6 +24,52 @@ from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Marks a model that has not been load-attempted yet (None means a load
+# was tried and failed, so it isn't retried per call).
+_UNSET = object()
+
+
+def _accelerate_available() -> bool:
+    """low_cpu_mem_usage / device_map loading needs accelerate."""
+    try:
+        import accelerate  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _np_softmax(logits: np.ndarray) -> np.ndarray:
+    """Numerically stable softmax over the last axis, in numpy so ONNX
+    outputs never round-trip through torch."""
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class MultiHeadBert(nn.Module):
+    """One BERT encoder feeding category and priority heads.
+
+    The two stock classifiers duplicate a ~110M-param encoder over the
+    same input text; sharing it halves weight memory and runs the
+    dominant encoder forward pass once per prediction.
+    """
+
+    def __init__(self, encoder, num_categories: int, num_priorities: int,
+                 dropout: float = 0.1):
+        super().__init__()
+        self.encoder = encoder
+        hidden_size = encoder.config.hidden_size
+        self.dropout = nn.Dropout(dropout)
+        self.cat_head = nn.Linear(hidden_size, num_categories)
+        self.prio_head = nn.Linear(hidden_size, num_priorities)
+
+    def forward(self, input_ids=None, attention_mask=None, **kwargs):
+        outputs = self.encoder(
+            input_ids=input_ids, attention_mask=attention_mask
+        )
+        pooled = self.dropout(outputs.pooler_output)
+        return self.cat_head(pooled), self.prio_head(pooled)
+
 
 class TicketClassifierModel:
     """
@@ -29,13 +77,20 @@ class TicketClassifierModel:
     Supports both category and priority classification
     """
 
-    def __init__(self, model_dir: Optional[Path] = None, num_categories: int = 7):
+    def __init__(
+            self,
+            model_dir: Optional[Path] = None,
+            num_categories: int = 7,
+            use_onnx: bool = False
+    ):
         """
         Initialize ticket classifier
 
         Args:
             model_dir: Directory for saving/loading models
             num_categories: Number of ticket categories
+            use_onnx: Serve predictions through INT8-quantized ONNX
+                Runtime sessions instead of the FP32 torch models
         """
         self.model_dir = model_dir or Path(__file__).parent / 'saved_models'
         self.model_dir.mkdir(exist_ok=True)
@@ -56,60 +111,209 @@ class TicketClassifierModel:
 
         self.priorities = ['low', 'medium', 'high', 'urgent']
 
-        # Models
-        self.category_model = None
-        self.category_tokenizer = None
-        self.priority_model = None
-        self.priority_tokenizer = None
+        # Models, label encoders and optional INT8 ONNX sessions resolve
+        # lazily on first access (see the properties below), so a process
+        # that never classifies tickets never loads BERT.
+        self._category_model = _UNSET
+        self._category_tokenizer = None
+        self._priority_model = _UNSET
+        self._priority_tokenizer = None
+        self._category_label_encoder = None
+        self._priority_label_encoder = None
+
+        # Single-encoder multi-task model assembled from the two
+        # checkpoints (see _build_shared_model)
+        self._shared_model = _UNSET
+
+        # Optional INT8 ONNX Runtime sessions (~4x smaller weights,
+        # ~2x CPU throughput vs FP32 torch)
+        self.use_onnx = use_onnx
+        self._category_session = None
+        self._priority_session = None
+
+    @staticmethod
+    def _quantization_kwargs() -> Dict:
+        """from_pretrained kwargs for INT8 classifier weights.
+
+        load_in_8bit halves memory vs FP16 so both BERT heads co-reside
+        with the chatbot models on one GPU. Empty dict — full-precision
+        load — when CUDA or bitsandbytes is missing, or env QUANTIZE=none
+        is set for accuracy debugging.
+        """
+        if os.environ.get('QUANTIZE', '8bit').lower() == 'none':
+            return {}
+        if not torch.cuda.is_available():
+            return {}
+        try:
+            import bitsandbytes  # noqa: F401
+            from transformers import BitsAndBytesConfig
+        except ImportError:
+            logger.warning(
+                "bitsandbytes not installed; loading classifiers unquantized"
+            )
+            return {}
+        return {
+            'quantization_config': BitsAndBytesConfig(load_in_8bit=True),
+            'device_map': 'auto',
+        }
 
-        # Label encoders
-        self.category_label_encoder = None
-        self.priority_label_encoder = None
+    def _load_kwargs(self) -> Dict:
+        """from_pretrained kwargs for classifier checkpoints.
 
-        # Load models
-        self.load_models()
+        Prefers INT8 quantization; otherwise, on CUDA hosts with
+        accelerate, streams FP16 weights straight onto the device via
+        meta tensors instead of materializing FP32 in host RAM first.
+        Empty dict means plain load plus an explicit .to(device).
+        """
+        kwargs = self._quantization_kwargs()
+        if kwargs:
+            return kwargs
+        if torch.cuda.is_available() and _accelerate_available():
+            return {
+                'low_cpu_mem_usage': True,
+                'torch_dtype': torch.float16,
+                'device_map': {'': self.device.index or 0},
+            }
+        return {}
 
     def load_models(self):
-        """Load pre-trained or fine-tuned models"""
+        """Warm both classifiers (and the shared encoder) eagerly.
+
+        Models normally load lazily on first use; call this from workers
+        that want the cost up front instead of on the first prediction.
+        """
         try:
-            self._load_category_model()
-            self._load_priority_model()
+            _ = self.shared_model  # touches both underlying models
             logger.info("Classifier models loaded successfully")
         except Exception as e:
             logger.error(f"Error loading classifier models: {e}")
 
+    def _ensure_category(self):
+        if self._category_model is _UNSET:
+            self._category_model = None
+            self._load_category_model()
+
+    def _ensure_priority(self):
+        if self._priority_model is _UNSET:
+            self._priority_model = None
+            self._load_priority_model()
+
+    @property
+    def category_model(self):
+        self._ensure_category()
+        return self._category_model
+
+    @property
+    def category_tokenizer(self):
+        self._ensure_category()
+        return self._category_tokenizer
+
+    @property
+    def category_label_encoder(self):
+        self._ensure_category()
+        return self._category_label_encoder
+
+    @property
+    def category_session(self):
+        self._ensure_category()
+        return self._category_session
+
+    @property
+    def priority_model(self):
+        self._ensure_priority()
+        return self._priority_model
+
+    @property
+    def priority_tokenizer(self):
+        self._ensure_priority()
+        return self._priority_tokenizer
+
+    @property
+    def priority_label_encoder(self):
+        self._ensure_priority()
+        return self._priority_label_encoder
+
+    @property
+    def priority_session(self):
+        self._ensure_priority()
+        return self._priority_session
+
+    @property
+    def shared_model(self):
+        if self._shared_model is _UNSET:
+            self._shared_model = self._build_shared_model()
+        return self._shared_model
+
+    def _build_shared_model(self) -> Optional[MultiHeadBert]:
+        """Fold both checkpoints into one encoder with two heads.
+
+        Copies the category model's encoder plus both classifier layers;
+        returns None for non-BERT fine-tuned checkpoints, where predict()
+        keeps the two-model path.
+        """
+        if not (self.category_model and self.priority_model):
+            return None
+        try:
+            shared = MultiHeadBert(
+                self.category_model.bert,
+                self.num_categories,
+                len(self.priorities)
+            )
+            shared.cat_head.load_state_dict(
+                self.category_model.classifier.state_dict()
+            )
+            shared.prio_head.load_state_dict(
+                self.priority_model.classifier.state_dict()
+            )
+            shared.to(self.device)
+            shared.eval()
+            return shared
+        except AttributeError as e:
+            logger.warning(f"Cannot share encoder between classifiers: {e}")
+            return None
+
     def _load_category_model(self):
         """Load category classification model"""
         try:
             model_path = self.model_dir / 'category_classifier'
+            load_kwargs = self._load_kwargs()
 
             if model_path.exists():
                 # Load fine-tuned model
-                self.category_model = AutoModelForSequenceClassification.from_pretrained(
-                    model_path
+                self._category_model = AutoModelForSequenceClassification.from_pretrained(
+                    model_path, **load_kwargs
+                )
+                self._category_tokenizer = AutoTokenizer.from_pretrained(
+                    model_path, use_fast=True
                 )
-                self.category_tokenizer = AutoTokenizer.from_pretrained(model_path)
                 logger.info("Fine-tuned category classifier loaded")
             else:
                 # Load pre-trained BERT
-                self.category_model = BertForSequenceClassification.from_pretrained(
+                self._category_model = BertForSequenceClassification.from_pretrained(
                     'bert-base-uncased',
-                    num_labels=self.num_categories
+                    num_labels=self.num_categories,
+                    **load_kwargs
                 )
-                self.category_tokenizer = BertTokenizer.from_pretrained('bert-base-uncased')
+                self._category_tokenizer = BertTokenizerFast.from_pretrained('bert-base-uncased')
                 logger.info("Pre-trained category classifier loaded")
 
-            self.category_model.to(self.device)
-            self.category_model.eval()
+            if 'device_map' not in load_kwargs:  # otherwise already placed
+                self._category_model.to(self.device)
+            self._category_model.eval()
+
+            if self.use_onnx:
+                self._category_session = self._quantized_onnx_session(
+                    'category_classifier', self._category_model
+                )
 
             # Load label encoder
             encoder_path = self.model_dir / 'category_label_encoder.pkl'
             if encoder_path.exists():
-                self.category_label_encoder = joblib.load(encoder_path)
+                self._category_label_encoder = joblib.load(encoder_path)
             else:
                 from sklearn.preprocessing import LabelEncoder
-                self.category_label_encoder = LabelEncoder()
-                self.category_label_encoder.fit(self.categories)
+                self._category_label_encoder = LabelEncoder()
+                self._category_label_encoder.fit(self.categories)
 
         except Exception as e:
             logger.error(f"Error loading category model: {e}")
@@ -118,36 +322,130 @@ class TicketClassifierModel:
         """Load priority classification model"""
         try:
             model_path = self.model_dir / 'priority_classifier'
+            load_kwargs = self._load_kwargs()
 
             if model_path.exists():
-                self.priority_model = AutoModelForSequenceClassification.from_pretrained(
-                    model_path
+                self._priority_model = AutoModelForSequenceClassification.from_pretrained(
+                    model_path, **load_kwargs
+                )
+                self._priority_tokenizer = AutoTokenizer.from_pretrained(
+                    model_path, use_fast=True
                 )
-                self.priority_tokenizer = AutoTokenizer.from_pretrained(model_path)
                 logger.info("Fine-tuned priority classifier loaded")
             else:
-                self.priority_model = BertForSequenceClassification.from_pretrained(
+                self._priority_model = BertForSequenceClassification.from_pretrained(
                     'bert-base-uncased',
-                    num_labels=len(self.priorities)
+                    num_labels=len(self.priorities),
+                    **load_kwargs
                 )
-                self.priority_tokenizer = BertTokenizer.from_pretrained('bert-base-uncased')
+                self._priority_tokenizer = BertTokenizerFast.from_pretrained('bert-base-uncased')
                 logger.info("Pre-trained priority classifier loaded")
 
-            self.priority_model.to(self.device)
-            self.priority_model.eval()
+            if 'device_map' not in load_kwargs:  # otherwise already placed
+                self._priority_model.to(self.device)
+            self._priority_model.eval()
+
+            if self.use_onnx:
+                self._priority_session = self._quantized_onnx_session(
+                    'priority_classifier', self._priority_model
+                )
 
             # Load label encoder
             encoder_path = self.model_dir / 'priority_label_encoder.pkl'
             if encoder_path.exists():
-                self.priority_label_encoder = joblib.load(encoder_path)
+                self._priority_label_encoder = joblib.load(encoder_path)
             else:
                 from sklearn.preprocessing import LabelEncoder
-                self.priority_label_encoder = LabelEncoder()
-                self.priority_label_encoder.fit(self.priorities)
+                self._priority_label_encoder = LabelEncoder()
+                self._priority_label_encoder.fit(self.priorities)
 
         except Exception as e:
             logger.error(f"Error loading priority model: {e}")
 
+    def _quantized_onnx_session(self, name: str, model):
+        """Export a model to ONNX once, INT8-quantize it, and return a
+        cached InferenceSession; None when onnxruntime is unavailable."""
+        try:
+            import onnxruntime as ort
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+        except ImportError:
+            logger.warning(
+                "use_onnx requested but onnxruntime is not installed; "
+                "keeping the FP32 torch path"
+            )
+            return None
+
+        try:
+            int8_path = self.model_dir / f'{name}.int8.onnx'
+            if not int8_path.exists():
+                fp32_path = self.model_dir / f'{name}.onnx'
+                if not fp32_path.exists():
+                    dummy_ids = torch.ones(1, 8, dtype=torch.long)
+                    torch.onnx.export(
+                        model.cpu(),
+                        (dummy_ids, dummy_ids),
+                        str(fp32_path),
+                        input_names=['input_ids', 'attention_mask'],
+                        output_names=['logits'],
+                        dynamic_axes={
+                            'input_ids': {0: 'batch', 1: 'seq'},
+                            'attention_mask': {0: 'batch', 1: 'seq'},
+                            'logits': {0: 'batch'},
+                        },
+                        opset_version=14,
+                    )
+                    model.to(self.device)
+                quantize_dynamic(
+                    str(fp32_path),
+                    str(int8_path),
+                    weight_type=QuantType.QInt8,
+                )
+                logger.info(f"Quantized ONNX model written to {int8_path}")
+
+            return ort.InferenceSession(
+                str(int8_path),
+                providers=['CUDAExecutionProvider', 'CPUExecutionProvider'],
+            )
+        except Exception as e:
+            logger.error(f"Error building ONNX session for {name}: {e}")
+            return None
+
+    def _run_onnx(self, session, tokenizer, text) -> np.ndarray:
+        """Tokenize in numpy and run one quantized session, returning
+        (batch, num_labels) probabilities without touching torch."""
+        encoding = tokenizer(
+            text,
+            return_tensors='np',
+            max_length=512,
+            truncation=True,
+            padding=True
+        )
+        logits = session.run(
+            ['logits'],
+            {
+                'input_ids': encoding['input_ids'].astype(np.int64),
+                'attention_mask': encoding['attention_mask'].astype(np.int64),
+            },
+        )[0]
+        return _np_softmax(logits)
+
+    @functools.lru_cache(maxsize=4096)
+    def _tokenize_category(self, text: str):
+        """Tokenize once per distinct text and memoize.
+
+        Retries and evaluation runs re-submit identical titles; the
+        numpy arrays returned here are reused as cache values and only
+        converted to device tensors at call time.
+        """
+        encoding = self.category_tokenizer(
+            text,
+            return_tensors='np',
+            max_length=512,
+            truncation=True,
+            padding=True
+        )
+        return encoding['input_ids'], encoding['attention_mask']
+
     def predict_category(self, text: str) -> Dict:
         """
         Predict ticket category
@@ -162,48 +460,58 @@ class TicketClassifierModel:
             if not self.category_model or not self.category_tokenizer:
                 return {'category': 'General Support', 'confidence': 0.5, 'error': 'Model not loaded'}
 
-            # Tokenize
-            inputs = self.category_tokenizer(
-                text,
-                return_tensors='pt',
-                max_length=512,
-                truncation=True,
-                padding=True
-            ).to(self.device)
+            if self.category_session is not None:
+                probs = self._run_onnx(
+                    self.category_session, self.category_tokenizer, text
+                )[0]
+                k = min(3, len(self.categories))
+                top_indices = np.argpartition(probs, -k)[-k:]
+                top_indices = top_indices[np.argsort(probs[top_indices])[::-1]]
+                if self.category_label_encoder:
+                    labels = self.category_label_encoder.inverse_transform(top_indices)
+                else:
+                    labels = [self.categories[idx] for idx in top_indices]
+                return {
+                    'category': labels[0],
+                    'confidence': float(probs[top_indices[0]]),
+                    'top_predictions': [
+                        {'category': cat, 'confidence': float(probs[idx])}
+                        for cat, idx in zip(labels, top_indices)
+                    ]
+                }
+
+            # Tokenize (memoized per distinct text)
+            input_ids, attention_mask = self._tokenize_category(text)
+            inputs = {
+                'input_ids': torch.from_numpy(input_ids).to(self.device),
+                'attention_mask': torch.from_numpy(attention_mask).to(self.device),
+            }
 
             # Predict
-            with torch.no_grad():
+            with torch.inference_mode():
                 outputs = self.category_model(**inputs)
                 logits = outputs.logits
                 probs = torch.softmax(logits, dim=-1)
+                top_probs, top_indices = torch.topk(
+                    probs[0], k=min(3, len(self.categories))
+                )
 
-            # Get prediction
-            predicted_idx = torch.argmax(probs, dim=-1).item()
-            confidence = probs[0][predicted_idx].item()
-
-            # Decode label
+            # One device->host sync for each tensor, one sklearn call for
+            # all labels — not a sync plus an inverse_transform per rank
+            top_probs = top_probs.cpu().tolist()
+            top_indices = top_indices.cpu().tolist()
             if self.category_label_encoder:
-                category = self.category_label_encoder.inverse_transform([predicted_idx])[0]
+                labels = self.category_label_encoder.inverse_transform(top_indices)
             else:
-                category = self.categories[predicted_idx]
-
-            # Get top 3 predictions
-            top_probs, top_indices = torch.topk(probs[0], k=min(3, len(self.categories)))
-            top_predictions = []
-            for prob, idx in zip(top_probs, top_indices):
-                if self.category_label_encoder:
-                    cat = self.category_label_encoder.inverse_transform([idx.item()])[0]
-                else:
-                    cat = self.categories[idx.item()]
-                top_predictions.append({
-                    'category': cat,
-                    'confidence': prob.item()
-                })
+                labels = [self.categories[idx] for idx in top_indices]
 
             return {
-                'category': category,
-                'confidence': float(confidence),
-                'top_predictions': top_predictions
+                'category': labels[0],
+                'confidence': float(top_probs[0]),
+                'top_predictions': [
+                    {'category': cat, 'confidence': prob}
+                    for cat, prob in zip(labels, top_probs)
+                ]
             }
 
         except Exception as e:
@@ -214,6 +522,76 @@ class TicketClassifierModel:
                 'error': str(e)
             }
 
+    def predict_category_batch(self, texts: List[str], batch_size: int = 32) -> List[Dict]:
+        """
+        Predict categories for many tickets in batched forward passes
+
+        BERT prefill is compute-bound, so one padded batch of B texts
+        costs roughly the same wall time as a single text; use this
+        instead of looping predict_category over a collection.
+
+        Args:
+            texts: Ticket texts (title + description)
+            batch_size: Number of texts per forward pass
+
+        Returns:
+            List of prediction dictionaries, one per input text
+        """
+        if not self.category_model or not self.category_tokenizer:
+            return [
+                {'category': 'General Support', 'confidence': 0.5, 'error': 'Model not loaded'}
+                for _ in texts
+            ]
+
+        results = []
+        try:
+            k = min(3, len(self.categories))
+            for start in range(0, len(texts), batch_size):
+                batch = texts[start:start + batch_size]
+
+                inputs = self.category_tokenizer(
+                    batch,
+                    return_tensors='pt',
+                    max_length=512,
+                    truncation=True,
+                    padding=True
+                ).to(self.device)
+
+                with torch.inference_mode():
+                    logits = self.category_model(**inputs).logits
+                    probs = torch.softmax(logits, dim=-1)
+                    top_probs, top_indices = torch.topk(probs, k=k, dim=-1)
+
+                # One device->host copy for the whole batch
+                top_probs = top_probs.cpu().numpy()
+                top_indices = top_indices.cpu().numpy()
+
+                if self.category_label_encoder:
+                    labels = self.category_label_encoder.inverse_transform(
+                        top_indices.reshape(-1)
+                    ).reshape(top_indices.shape)
+                else:
+                    labels = np.asarray(self.categories)[top_indices]
+
+                for row_labels, row_probs in zip(labels, top_probs):
+                    results.append({
+                        'category': row_labels[0],
+                        'confidence': float(row_probs[0]),
+                        'top_predictions': [
+                            {'category': cat, 'confidence': float(prob)}
+                            for cat, prob in zip(row_labels, row_probs)
+                        ]
+                    })
+
+            return results
+
+        except Exception as e:
+            logger.error(f"Error in batched category prediction: {e}")
+            return results + [
+                {'category': 'General Support', 'confidence': 0.5, 'error': str(e)}
+                for _ in range(len(texts) - len(results))
+            ]
+
     def predict_priority(self, text: str) -> Dict:
         """
         Predict ticket priority
@@ -228,6 +606,20 @@ class TicketClassifierModel:
             if not self.priority_model or not self.priority_tokenizer:
                 return {'priority': 'medium', 'confidence': 0.5, 'error': 'Model not loaded'}
 
+            if self.priority_session is not None:
+                probs = self._run_onnx(
+                    self.priority_session, self.priority_tokenizer, text
+                )[0]
+                predicted_idx = int(np.argmax(probs))
+                if self.priority_label_encoder:
+                    priority = self.priority_label_encoder.inverse_transform([predicted_idx])[0]
+                else:
+                    priority = self.priorities[predicted_idx]
+                return {
+                    'priority': priority,
+                    'confidence': float(probs[predicted_idx])
+                }
+
             # Tokenize
             inputs = self.priority_tokenizer(
                 text,
@@ -238,16 +630,13 @@ class TicketClassifierModel:
             ).to(self.device)
 
             # Predict
-            with torch.no_grad():
+            with torch.inference_mode():
                 outputs = self.priority_model(**inputs)
                 logits = outputs.logits
                 probs = torch.softmax(logits, dim=-1)
+                confidence, predicted_idx = torch.max(probs[0], dim=-1)
 
-            # Get prediction
-            predicted_idx = torch.argmax(probs, dim=-1).item()
-            confidence = probs[0][predicted_idx].item()
-
-            # Decode label
+            predicted_idx = predicted_idx.item()
             if self.priority_label_encoder:
                 priority = self.priority_label_encoder.inverse_transform([predicted_idx])[0]
             else:
@@ -255,7 +644,7 @@ class TicketClassifierModel:
 
             return {
                 'priority': priority,
-                'confidence': float(confidence)
+                'confidence': float(confidence.item())
             }
 
         except Exception as e:
@@ -276,6 +665,63 @@ class TicketClassifierModel:
         Returns:
             Dictionary with both predictions
         """
+        # Both models default to bert-base-uncased, so the tokenized
+        # tensors can be shared between the two forward passes instead of
+        # tokenizing the same text twice.
+        if (
+                self.category_model and self.priority_model
+                and self.category_tokenizer and self.priority_tokenizer
+                and self.category_tokenizer.name_or_path == self.priority_tokenizer.name_or_path
+        ):
+            try:
+                inputs = self.category_tokenizer(
+                    text,
+                    return_tensors='pt',
+                    max_length=512,
+                    truncation=True,
+                    padding=True
+                ).to(self.device)
+
+                with torch.inference_mode():
+                    if self.shared_model is not None:
+                        # One encoder pass feeds both heads
+                        category_logits, priority_logits = self.shared_model(**inputs)
+                    else:
+                        category_logits = self.category_model(**inputs).logits
+                        priority_logits = self.priority_model(**inputs).logits
+                    category_probs = torch.softmax(category_logits, dim=-1)
+                    priority_probs = torch.softmax(priority_logits, dim=-1)
+
+                top_probs, top_indices = torch.topk(
+                    category_probs[0], k=min(3, len(self.categories))
+                )
+                top_probs = top_probs.cpu().tolist()
+                top_indices = top_indices.cpu().tolist()
+                prio_confidence, prio_idx = torch.max(priority_probs[0], dim=-1)
+                prio_idx = prio_idx.item()
+
+                if self.category_label_encoder:
+                    labels = self.category_label_encoder.inverse_transform(top_indices)
+                else:
+                    labels = [self.categories[idx] for idx in top_indices]
+                if self.priority_label_encoder:
+                    priority = self.priority_label_encoder.inverse_transform([prio_idx])[0]
+                else:
+                    priority = self.priorities[prio_idx]
+
+                return {
+                    'category': labels[0],
+                    'category_confidence': float(top_probs[0]),
+                    'priority': priority,
+                    'priority_confidence': float(prio_confidence.item()),
+                    'top_categories': [
+                        {'category': cat, 'confidence': prob}
+                        for cat, prob in zip(labels, top_probs)
+                    ]
+                }
+            except Exception as e:
+                logger.error(f"Error in fused prediction: {e}")
+
         category_result = self.predict_category(text)
         priority_result = self.predict_priority(text)
 
@@ -311,26 +757,31 @@ class TicketClassifierModel:
             # Prepare dataset
             class TicketDataset(Dataset):
                 def __init__(self, data, tokenizer, label_encoder):
-                    self.texts = [item[0] for item in data]
-                    self.labels = label_encoder.transform([item[1] for item in data])
-                    self.tokenizer = tokenizer
-
-                def __len__(self):
-                    return len(self.texts)
-
-                def __getitem__(self, idx):
-                    encoding = self.tokenizer(
-                        self.texts[idx],
+                    # Tokenize the whole corpus once up front; __getitem__
+                    # then just indexes preallocated tensors instead of
+                    # re-running WordPiece for every sample on every epoch
+                    encodings = tokenizer(
+                        [item[0] for item in data],
                         max_length=512,
                         padding='max_length',
                         truncation=True,
                         return_tensors='pt'
                     )
+                    self.input_ids = encodings['input_ids']
+                    self.attention_mask = encodings['attention_mask']
+                    self.labels = torch.tensor(
+                        label_encoder.transform([item[1] for item in data]),
+                        dtype=torch.long
+                    )
+
+                def __len__(self):
+                    return self.labels.shape[0]
 
+                def __getitem__(self, idx):
                     return {
-                        'input_ids': encoding['input_ids'].flatten(),
-                        'attention_mask': encoding['attention_mask'].flatten(),
-                        'labels': torch.tensor(self.labels[idx], dtype=torch.long)
+                        'input_ids': self.input_ids[idx],
+                        'attention_mask': self.attention_mask[idx],
+                        'labels': self.labels[idx]
                     }
 
             # Fit label encoder
@@ -344,7 +795,12 @@ class TicketClassifierModel:
                 self.category_label_encoder
             )
 
-            # Training arguments
+            # Training arguments. Mixed precision roughly doubles step
+            # throughput on tensor-core GPUs and gradient checkpointing
+            # trades recompute for ~40% less activation memory, which is
+            # what actually bounds batch size here.
+            use_cuda = torch.cuda.is_available()
+            bf16 = use_cuda and torch.cuda.is_bf16_supported()
             training_args = TrainingArguments(
                 output_dir=str(self.model_dir / 'category_classifier_training'),
                 num_train_epochs=epochs,
@@ -357,8 +813,17 @@ class TicketClassifierModel:
                 save_steps=1000,
                 evaluation_strategy="steps" if validation_data else "no",
                 save_total_limit=2,
+                bf16=bf16,
+                fp16=use_cuda and not bf16,
+                tf32=use_cuda,
+                gradient_checkpointing=True,
+                dataloader_num_workers=4,
+                dataloader_pin_memory=True,
+                optim='adamw_torch_fused' if use_cuda else 'adamw_torch',
             )
 
+            self.category_model.gradient_checkpointing_enable()
+
             # Trainer
             trainer = Trainer(
                 model=self.category_model,
@@ -385,6 +850,92 @@ class TicketClassifierModel:
         except Exception as e:
             logger.error(f"Error training category model: {e}")
 
+    def train_joint(
+            self,
+            training_data: List[Tuple[str, str, str]],
+            epochs: int = 3,
+            batch_size: int = 16,
+            learning_rate: float = 2e-5
+    ):
+        """
+        Train category and priority heads jointly on the shared encoder
+
+        Args:
+            training_data: List of (text, category, priority) tuples
+            epochs: Number of training epochs
+            batch_size: Batch size
+            learning_rate: Learning rate
+        """
+        if self.shared_model is None:
+            logger.error("No shared model available for joint training")
+            return
+
+        try:
+            from torch.utils.data import DataLoader
+
+            texts = [item[0] for item in training_data]
+            category_labels = torch.tensor(
+                self.category_label_encoder.transform(
+                    [item[1] for item in training_data]
+                ),
+                dtype=torch.long
+            )
+            priority_labels = torch.tensor(
+                self.priority_label_encoder.transform(
+                    [item[2] for item in training_data]
+                ),
+                dtype=torch.long
+            )
+
+            encodings = self.category_tokenizer(
+                texts,
+                max_length=512,
+                padding=True,
+                truncation=True,
+                return_tensors='pt'
+            )
+
+            dataset = list(zip(
+                encodings['input_ids'],
+                encodings['attention_mask'],
+                category_labels,
+                priority_labels
+            ))
+            dataloader = DataLoader(dataset, batch_size=batch_size, shuffle=True)
+
+            optimizer = torch.optim.AdamW(
+                self.shared_model.parameters(), lr=learning_rate
+            )
+            loss_fn = nn.CrossEntropyLoss()
+
+            self.shared_model.train()
+            for epoch in range(epochs):
+                total_loss = 0.0
+                for input_ids, attention_mask, cat_y, prio_y in dataloader:
+                    cat_logits, prio_logits = self.shared_model(
+                        input_ids=input_ids.to(self.device),
+                        attention_mask=attention_mask.to(self.device)
+                    )
+                    # Summed loss trains both heads through one encoder pass
+                    loss = (
+                        loss_fn(cat_logits, cat_y.to(self.device))
+                        + loss_fn(prio_logits, prio_y.to(self.device))
+                    )
+                    total_loss += loss.item()
+
+                    loss.backward()
+                    optimizer.step()
+                    optimizer.zero_grad()
+
+                avg_loss = total_loss / len(dataloader)
+                logger.info(f"Epoch {epoch + 1}/{epochs}, Loss: {avg_loss:.4f}")
+
+            self.shared_model.eval()
+            logger.info("Joint training complete")
+
+        except Exception as e:
+            logger.error(f"Error in joint training: {e}")
+
     def evaluate(self, test_data: List[Tuple[str, str]]) -> Dict:
         """
         Evaluate model performance
@@ -399,11 +950,11 @@ class TicketClassifierModel:
             texts = [item[0] for item in test_data]
             true_labels = [item[1] for item in test_data]
 
-            # Predict
-            predictions = []
-            for text in texts:
-                result = self.predict_category(text)
-                predictions.append(result['category'])
+            # Predict in batches rather than one forward pass per text
+            predictions = [
+                result['category']
+                for result in self.predict_category_batch(texts)
+            ]
 
             # Calculate metrics
             accuracy = accuracy_score(true_labels, predictions)
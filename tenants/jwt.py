@@ -0,0 +1,41 @@
+"""
+JWT customization for multi-tenant auth
+
+Embeds the user's tenant memberships in the access token so middleware
+can authorize tenant access from the (already signature-checked) token
+instead of a per-request TenantUser query. Staleness is bounded by the
+access-token lifetime; role changes take effect at the next refresh.
+"""
+
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.views import TokenObtainPairView
+
+
+class TenantTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Token serializer that adds a tenant_memberships claim"""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+
+        from .models import TenantUser
+
+        token['tenant_memberships'] = {
+            str(membership.tenant_id): {
+                'id': membership.id,
+                'role': membership.role,
+                'is_active': membership.is_active,
+                'can_manage_tickets': membership.can_manage_tickets,
+                'can_view_analytics': membership.can_view_analytics,
+                'can_manage_chatbot': membership.can_manage_chatbot,
+                'can_manage_users': membership.can_manage_users,
+            }
+            for membership in TenantUser.objects.filter(user=user)
+        }
+
+        return token
+
+
+class TenantTokenObtainPairView(TokenObtainPairView):
+    """Token view issuing tokens with the tenant_memberships claim"""
+    serializer_class = TenantTokenObtainPairSerializer
@@ -7,11 +7,85 @@ from django.http import Http404
 from django.utils.deprecation import MiddlewareMixin
 from django.shortcuts import redirect
 from django.urls import reverse
+from django.db.models.signals import post_save, post_delete
+from django.db.backends.signals import connection_created
 from .models import Tenant, Domain
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Hostname -> (Tenant, expiry) cache shared by all requests in the
+# worker. Tenant membership changes rarely, so the dominant per-request
+# Domain/Tenant query is served from memory; the short TTL plus signal
+# invalidation below bound staleness.
+_TENANT_CACHE_TTL = 60
+_TENANT_CACHE_MAX = 1024
+_tenant_cache = {}
+_tenant_cache_lock = threading.RLock()
+
+
+def _cached_tenant(hostname):
+    """Return the cached tenant for hostname, or None on miss/expiry"""
+    with _tenant_cache_lock:
+        entry = _tenant_cache.get(hostname)
+        if entry is None:
+            return None
+        tenant, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del _tenant_cache[hostname]
+            return None
+        return tenant
+
+
+def _store_tenant(hostname, tenant):
+    """Cache a resolved tenant, evicting everything if the cache is full
+    (full flushes are rare and cheaper than LRU bookkeeping here)"""
+    with _tenant_cache_lock:
+        if len(_tenant_cache) >= _TENANT_CACHE_MAX:
+            _tenant_cache.clear()
+        _tenant_cache[hostname] = (tenant, time.monotonic() + _TENANT_CACHE_TTL)
+
+
+def _flush_tenant_cache(**kwargs):
+    """Drop all cached resolutions when any Domain or Tenant changes"""
+    with _tenant_cache_lock:
+        _tenant_cache.clear()
+
+
+post_save.connect(_flush_tenant_cache, sender=Domain,
+                  dispatch_uid='tenant_cache_domain_save')
+post_delete.connect(_flush_tenant_cache, sender=Domain,
+                    dispatch_uid='tenant_cache_domain_delete')
+post_save.connect(_flush_tenant_cache, sender=Tenant,
+                  dispatch_uid='tenant_cache_tenant_save')
+post_delete.connect(_flush_tenant_cache, sender=Tenant,
+                    dispatch_uid='tenant_cache_tenant_delete')
+
+
+def _activate_tenant(tenant):
+    """Switch the connection to the tenant schema, skipping the
+    SET search_path round-trip when it is already active.
+
+    The active schema is tracked on the DatabaseWrapper, which Django
+    reuses across reconnects, so the flag is cleared whenever a fresh
+    underlying connection is created.
+    """
+    from django.db import connection
+    if getattr(connection, '_current_schema', None) != tenant.schema_name:
+        tenant.activate()
+        connection._current_schema = tenant.schema_name
+
+
+def _reset_schema_flag(sender, connection, **kwargs):
+    """New raw connections start on the default search_path"""
+    connection._current_schema = None
+
+
+connection_created.connect(_reset_schema_flag,
+                           dispatch_uid='tenant_schema_flag_reset')
+
 
 class TenantMiddleware(MiddlewareMixin):
     """
@@ -24,14 +98,24 @@ class TenantMiddleware(MiddlewareMixin):
         """
         hostname = request.get_host().split(':')[0].lower()
 
-        try:
-            # Try to get domain
-            domain = Domain.objects.select_related('tenant').get(
-                domain=hostname
-            )
+        cached = _cached_tenant(hostname)
+        if cached is not None:
+            request.tenant = cached
 
+            # Check if tenant is active
+            if not request.tenant.is_active:
+                logger.warning(f"Inactive tenant accessed: {request.tenant.name}")
+                return self.tenant_inactive_response(request)
+
+            # Set tenant schema
+            _activate_tenant(request.tenant)
+            return None
+
+        domain = self._resolve_domain(hostname)
+        if domain is not None:
             # Set tenant in request
             request.tenant = domain.tenant
+            _store_tenant(hostname, domain.tenant)
 
             # Check if tenant is active
             if not request.tenant.is_active:
@@ -39,17 +123,19 @@ class TenantMiddleware(MiddlewareMixin):
                 return self.tenant_inactive_response(request)
 
             # Set tenant schema
-            request.tenant.activate()
+            _activate_tenant(request.tenant)
 
-        except Domain.DoesNotExist:
+        else:
             # Check if this is the public schema
             if hostname in ['localhost', '127.0.0.1', 'test-server']:
-                try:
-                    # Get public tenant
-                    public_tenant = Tenant.objects.get(schema_name='public')
+                # Get public tenant (cached for a week, invalidated on save)
+                from .utils import get_tenant_by_schema
+                public_tenant = get_tenant_by_schema('public')
+                if public_tenant is not None:
                     request.tenant = public_tenant
-                    public_tenant.activate()
-                except Tenant.DoesNotExist:
+                    _store_tenant(hostname, public_tenant)
+                    _activate_tenant(public_tenant)
+                else:
                     logger.error("Public tenant not found")
                     raise Http404("Tenant not found")
             else:
@@ -58,6 +144,31 @@ class TenantMiddleware(MiddlewareMixin):
 
         return None
 
+    @staticmethod
+    def _resolve_domain(hostname):
+        """Resolve hostname to a Domain, allowing subdomain matches.
+
+        Tries the exact hostname and every parent suffix (so
+        app.acme.example.com also matches a registered acme.example.com)
+        with one indexed domain__in query, preferring the longest match.
+        Returns None when nothing is registered.
+        """
+        candidates = [hostname]
+        parts = hostname.split('.')
+        for i in range(1, len(parts) - 1):
+            candidates.append('.'.join(parts[i:]))
+
+        matches = {
+            d.domain: d
+            for d in Domain.objects.select_related('tenant').filter(
+                domain__in=candidates
+            )
+        }
+        for candidate in candidates:
+            if candidate in matches:
+                return matches[candidate]
+        return None
+
     @staticmethod
     def tenant_inactive_response(request):
         """
@@ -104,7 +215,39 @@ class TenantContextMiddleware(MiddlewareMixin):
         return response
 
 
-# noinspection PyGlobalUndefined
+# last_active buffer: one UPDATE per authenticated request serializes on
+# the TenantUser row, so timestamps are coalesced here and written as a
+# single bulk_update at most once per interval per worker. Sub-minute
+# precision isn't meaningful for an activity indicator.
+_LAST_ACTIVE_FLUSH_INTERVAL = 60
+_last_active_buffer = {}
+_last_active_lock = threading.Lock()
+_last_active_flushed = time.monotonic()
+
+
+def _record_last_active(tenant_user):
+    """Buffer the activity timestamp and flush the batch when due"""
+    global _last_active_flushed
+    from django.utils import timezone
+
+    with _last_active_lock:
+        _last_active_buffer[tenant_user.id] = timezone.now()
+        if time.monotonic() - _last_active_flushed < _LAST_ACTIVE_FLUSH_INTERVAL:
+            return
+        pending = dict(_last_active_buffer)
+        _last_active_buffer.clear()
+        _last_active_flushed = time.monotonic()
+
+    try:
+        from .models import TenantUser
+        TenantUser.objects.bulk_update(
+            [TenantUser(id=uid, last_active=ts) for uid, ts in pending.items()],
+            ['last_active']
+        )
+    except Exception as e:
+        logger.error(f"Error flushing last_active buffer: {e}")
+
+
 class TenantUserMiddleware(MiddlewareMixin):
     """
     Ensure user belongs to the current tenant
@@ -114,20 +257,32 @@ class TenantUserMiddleware(MiddlewareMixin):
         """
         Verify user tenant membership
         """
-        global TenantUser
         if request.user.is_authenticated and hasattr(request, 'tenant'):
             # Skip for superusers
             if request.user.is_superuser:
                 return None
 
-            # Check if user belongs to tenant
-            try:
-                from .models import TenantUser
-                tenant_user = TenantUser.objects.get(
-                    user=request.user,
-                    tenant=request.tenant
-                )
+            # Fast path: membership embedded in the JWT claim — no DB hit
+            claim_user = self._tenant_user_from_token(request)
+            if claim_user is not None:
+                if not claim_user.is_active:
+                    logger.warning(f"Inactive user accessed: {request.user.username}")
+                    return self.user_inactive_response(request)
+
+                request.tenant_user = claim_user
+                _record_last_active(claim_user)
+                return None
 
+            # Check if user belongs to tenant. first() branches on None
+            # instead of raising — under unauthorized-access pressure
+            # the exception + handler formatting is pure overhead.
+            from .models import TenantUser
+            tenant_user = TenantUser.objects.filter(
+                user=request.user,
+                tenant=request.tenant
+            ).first()
+
+            if tenant_user is not None:
                 # Check if user is active
                 if not tenant_user.is_active:
                     logger.warning(f"Inactive user accessed: {request.user.username}")
@@ -136,10 +291,10 @@ class TenantUserMiddleware(MiddlewareMixin):
                 # Add tenant user to request
                 request.tenant_user = tenant_user
 
-                # Update last active
-                tenant_user.update_last_active()
+                # Update last active (buffered; flushed in batches)
+                _record_last_active(tenant_user)
 
-            except TenantUser.DoesNotExist:
+            else:
                 # User doesn't belong to this tenant
                 logger.warning(
                     f"User {request.user.username} attempted to access "
@@ -160,6 +315,37 @@ class TenantUserMiddleware(MiddlewareMixin):
 
         return None
 
+    @staticmethod
+    def _tenant_user_from_token(request):
+        """Build a lightweight tenant_user from the JWT membership claim.
+
+        The token signature and expiry are verified here, so a valid
+        claim replaces the TenantUser query with an HMAC check. Returns
+        None whenever the token is absent, invalid, issued to a
+        different user, or predates the membership — callers then fall
+        back to the DB path, so a missing claim never denies access.
+        """
+        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
+        if not auth_header.startswith('Bearer '):
+            return None
+
+        try:
+            from rest_framework_simplejwt.tokens import AccessToken
+            token = AccessToken(auth_header[7:])
+        except Exception:
+            return None
+
+        if token.get('user_id') != request.user.id:
+            return None
+
+        memberships = token.get('tenant_memberships') or {}
+        claim = memberships.get(str(request.tenant.id))
+        if claim is None:
+            return None
+
+        from types import SimpleNamespace
+        return SimpleNamespace(**claim)
+
     @staticmethod
     def user_inactive_response(request):
         """
@@ -172,6 +358,55 @@ class TenantUserMiddleware(MiddlewareMixin):
         )
 
 
+def _ticket_quota_key(schema_name, now):
+    """Cache key for the tenant's ticket counter, scoped to the month"""
+    return f'quota:tickets:{schema_name}:{now:%Y%m}'
+
+
+def _seconds_to_month_end(now):
+    """Seconds from now until the first instant of next month"""
+    if now.month == 12:
+        next_month = now.replace(year=now.year + 1, month=1, day=1,
+                                 hour=0, minute=0, second=0, microsecond=0)
+    else:
+        next_month = now.replace(month=now.month + 1, day=1,
+                                 hour=0, minute=0, second=0, microsecond=0)
+    return int((next_month - now).total_seconds()) + 1
+
+
+def _bump_ticket_quota(sender, instance, created, **kwargs):
+    """Keep the cached monthly ticket counter in step with creations.
+
+    Tickets live in the tenant schema, so the active connection schema
+    identifies the tenant. incr on a missing key means the counter was
+    never seeded — the next quota check seeds it from the DB.
+    """
+    if not created:
+        return
+    from django.core.cache import cache
+    from django.db import connection
+    from django.utils import timezone
+    try:
+        cache.incr(_ticket_quota_key(connection.schema_name, timezone.now()))
+    except ValueError:
+        pass
+
+
+def _flush_user_quota(sender, instance, **kwargs):
+    """Recount active members on the next check after membership changes"""
+    from django.core.cache import cache
+    cache.delete(f'quota:users:{instance.tenant_id}')
+
+
+# Lazy string sender: tickets may not be loaded when this module imports
+post_save.connect(_bump_ticket_quota, sender='tickets.Ticket',
+                  dispatch_uid='quota_ticket_created')
+post_save.connect(_flush_user_quota, sender='tenants.TenantUser',
+                  dispatch_uid='quota_user_saved')
+post_delete.connect(_flush_user_quota, sender='tenants.TenantUser',
+                    dispatch_uid='quota_user_deleted')
+
+
 class TenantQuotaMiddleware(MiddlewareMixin):
     """
     Check tenant quotas and limits
@@ -226,16 +461,28 @@ class TenantQuotaMiddleware(MiddlewareMixin):
     def check_ticket_quota(tenant):
         """
         Check if tenant can create more tickets
+
+        Reads a cached monthly counter (kept current by the Ticket
+        post_save signal) instead of COUNTing the tickets table on every
+        write request; the one DB count runs only to seed the counter.
         """
-        from tickets.models import Ticket
+        from django.core.cache import cache
         from django.utils import timezone
 
-        # Get current month's ticket count
-        start_of_month = timezone.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        now = timezone.now()
+        key = _ticket_quota_key(tenant.schema_name, now)
+
+        current_count = cache.get(key)
+        if current_count is None:
+            from tickets.models import Ticket
 
-        current_count = Ticket.objects.filter(
-            created_at__gte=start_of_month
-        ).count()
+            # Get current month's ticket count
+            start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+            current_count = Ticket.objects.filter(
+                created_at__gte=start_of_month
+            ).count()
+            cache.add(key, current_count, _seconds_to_month_end(now))
 
         max_tickets = tenant.max_tickets_per_month or float('inf')
 
@@ -245,13 +492,21 @@ class TenantQuotaMiddleware(MiddlewareMixin):
     def check_user_quota(tenant):
         """
         Check if tenant can add more users
+
+        The active-member count is cached and invalidated by TenantUser
+        signals, so membership-quota checks don't COUNT per request.
         """
+        from django.core.cache import cache
         from .models import TenantUser
 
-        current_count = TenantUser.objects.filter(
-            tenant=tenant,
-            is_active=True
-        ).count()
+        key = f'quota:users:{tenant.id}'
+        current_count = cache.get(key)
+        if current_count is None:
+            current_count = TenantUser.objects.filter(
+                tenant=tenant,
+                is_active=True
+            ).count()
+            cache.add(key, current_count, 300)
 
         max_users = tenant.max_users or float('inf')
 
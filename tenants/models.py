@@ -103,6 +103,12 @@ class TenantUser(models.Model):
     class Meta:
         unique_together = ('user', 'tenant')
         ordering = ['-created_at']
+        indexes = [
+            # Serves the active-member quota count without scanning all
+            # of a tenant's memberships; (user, tenant) middleware
+            # lookups already use the unique_together index
+            models.Index(fields=['tenant', 'is_active']),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.tenant.name}"
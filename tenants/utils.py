@@ -0,0 +1,66 @@
+"""
+Request-level tenant helpers
+
+TenantMiddleware resolves request.tenant once per request (served from
+the hostname cache) and TenantUserMiddleware attaches the verified
+membership as request.tenant_user. These helpers let viewsets and
+serializers consume those instead of re-traversing user.tenantuser,
+which costs a query each time the user instance hasn't cached it.
+"""
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+
+# Tenant rows are effectively immutable after provisioning, so a long
+# TTL is safe; saves/deletes drop the entry eagerly anyway.
+_TENANT_SCHEMA_TTL = 604800  # one week
+
+
+def get_tenant_by_schema(schema_name):
+    """Tenant for a schema name, served from the cache.
+
+    Background jobs and the public-schema fallback look tenants up by
+    schema rather than hostname; this keeps those lookups off the DB on
+    the hot path. Returns None when no such tenant exists.
+    """
+    from .models import Tenant
+
+    return cache.get_or_set(
+        f'tenant:schema:{schema_name}',
+        lambda: Tenant.objects.filter(schema_name=schema_name).first(),
+        _TENANT_SCHEMA_TTL,
+    )
+
+
+def _flush_schema_cache(sender, instance, **kwargs):
+    """Drop the cached entry when a tenant is saved or removed"""
+    cache.delete(f'tenant:schema:{instance.schema_name}')
+
+
+post_save.connect(_flush_schema_cache, sender='tenants.Tenant',
+                  dispatch_uid='tenant_schema_cache_saved')
+post_delete.connect(_flush_schema_cache, sender='tenants.Tenant',
+                    dispatch_uid='tenant_schema_cache_deleted')
+
+
+def current_tenant_id(request):
+    """Tenant id for this request, without a DB hit when middleware ran"""
+    tenant = getattr(request, 'tenant', None)
+    if tenant is not None:
+        return tenant.id
+    if hasattr(request.user, 'tenantuser'):
+        return request.user.tenantuser.tenant_id
+    return None
+
+
+def current_tenant_user(request):
+    """The verified membership for this request, or None.
+
+    May be a TenantUser row or the lightweight JWT-claim object — both
+    expose role/is_active and the permission flags.
+    """
+    tenant_user = getattr(request, 'tenant_user', None)
+    if tenant_user is not None:
+        return tenant_user
+    if hasattr(request.user, 'tenantuser'):
+        return request.user.tenantuser
+    return None
@@ -8,6 +8,7 @@ from .serializers import (
     TenantSerializer, TenantUserSerializer,
     IntegrationSettingsSerializer, UserRegistrationSerializer
 )
+from .utils import current_tenant_id
 
 
 class TenantViewSet(viewsets.ModelViewSet):
@@ -16,9 +17,14 @@ class TenantViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        # Users can only see their own tenant
-        if hasattr(self.request.user, 'tenant-user'):
-            return Tenant.objects.filter(id=self.request.user.tenantuser.tenant.id)
+        # Users can only see their own tenant; users_count is aggregated
+        # in the same query for the serializer
+        from django.db.models import Count
+        tenant_id = current_tenant_id(self.request)
+        if tenant_id is not None:
+            return Tenant.objects.filter(
+                id=tenant_id
+            ).annotate(users_count=Count('tenant_users'))
         return Tenant.objects.none()
 
     @action(detail=True, methods=['get'])
@@ -44,9 +50,13 @@ class TenantUserViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        # Filter by current tenant
-        if hasattr(self.request.user, 'tenant-user'):
-            return TenantUser.objects.filter(tenant=self.request.user.tenantuser.tenant)
+        # Filter by current tenant; join the user row the serializer
+        # reads email/full name from
+        tenant_id = current_tenant_id(self.request)
+        if tenant_id is not None:
+            return TenantUser.objects.filter(
+                tenant_id=tenant_id
+            ).select_related('user')
         return TenantUser.objects.none()
 
     @action(detail=True, methods=['post'])
@@ -73,10 +83,9 @@ class IntegrationSettingsViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        if hasattr(self.request.user, 'tenant-user'):
-            return IntegrationSettings.objects.filter(
-                tenant=self.request.user.tenantuser.tenant
-            )
+        tenant_id = current_tenant_id(self.request)
+        if tenant_id is not None:
+            return IntegrationSettings.objects.filter(tenant_id=tenant_id)
         return IntegrationSettings.objects.none()
 
 
@@ -8,4 +8,8 @@ class TicketsConfig(AppConfig):
 
     def ready(self):
         """Import signals when app is ready"""
+        from config import drf_patches
+        drf_patches.apply()
+
+        from . import signals  # noqa: F401
 
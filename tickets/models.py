@@ -1,9 +1,68 @@
+from datetime import timezone as dt_timezone
+
 from django.db import models
+from django.db.models.functions import Cast, Concat, Extract, Left, LPad, Upper
 from django.contrib.auth.models import User
 from django.contrib.postgres.fields import ArrayField
-from django.utils import timezone
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+import sys
 import uuid
 
+# Shared by Ticket.priority and SLAPolicy.priority — one definition
+# instead of per-model literals that can drift apart
+PRIORITY_CHOICES = (
+    ('urgent', 'Urgent'),
+    ('high', 'High'),
+    ('medium', 'Medium'),
+    ('low', 'Low'),
+)
+
+
+class InternedCharField(models.CharField):
+    """CharField that interns values coming back from the database.
+
+    The choice columns hold a handful of distinct short strings, but
+    the driver materializes a fresh str per row; interning makes every
+    row share one object per value, which matters when list endpoints
+    serialize thousands of tickets.
+    """
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return sys.intern(value)
+
+
+def _ticket_id_expression():
+    """TKT-YYYYMMDD-XXXXXXXX, computed by Postgres from created_at + id.
+
+    The date portion is assembled from EXTRACT/LPAD instead of to_char
+    because generated columns require immutable expressions and to_char
+    is only stable; UTC matches what the old Python code produced.
+    """
+    def date_part(lookup, width):
+        return LPad(
+            Cast(
+                Extract('created_at', lookup, tzinfo=dt_timezone.utc),
+                output_field=models.CharField(max_length=4),
+            ),
+            width,
+            models.Value('0'),
+        )
+
+    return Concat(
+        models.Value('TKT-'),
+        date_part('year', 4),
+        date_part('month', 2),
+        date_part('day', 2),
+        models.Value('-'),
+        Upper(Left(
+            Cast('id', output_field=models.CharField(max_length=36)), 8
+        )),
+        output_field=models.CharField(max_length=50),
+    )
+
 
 class Ticket(models.Model):
     """
@@ -11,10 +70,18 @@ class Ticket(models.Model):
     """
     # Identifiers
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    ticket_id = models.CharField(max_length=50, unique=True, editable=False)
+    # Generated in the database so bulk_create/COPY imports get ids for
+    # free; Postgres returns the value on INSERT, no refresh needed
+    ticket_id = models.GeneratedField(
+        expression=_ticket_id_expression(),
+        output_field=models.CharField(max_length=50),
+        db_persist=True,
+        unique=True,
+    )
 
     # Customer Information
     customer_name = models.CharField(max_length=200)
+    customer_initials = models.CharField(max_length=4, blank=True, editable=False)
     customer_email = models.EmailField()
     customer_phone = models.CharField(max_length=20, blank=True)
     customer_id = models.CharField(max_length=100, blank=True)  # For external customer ID
@@ -28,18 +95,13 @@ class Ticket(models.Model):
     subcategory = models.CharField(max_length=100, blank=True)
     tags = ArrayField(models.CharField(max_length=50), blank=True, default=list)
 
-    priority = models.CharField(
+    priority = InternedCharField(
         max_length=20,
-        choices=[
-            ('urgent', 'Urgent'),
-            ('high', 'High'),
-            ('medium', 'Medium'),
-            ('low', 'Low'),
-        ],
+        choices=PRIORITY_CHOICES,
         default='medium'
     )
 
-    status = models.CharField(
+    status = InternedCharField(
         max_length=20,
         choices=[
             ('new', 'New'),
@@ -71,7 +133,7 @@ class Ticket(models.Model):
     first_response_at = models.DateTimeField(null=True, blank=True)
 
     # SLA Status
-    sla_status = models.CharField(
+    sla_status = InternedCharField(
         max_length=20,
         choices=[
             ('within_sla', 'Within SLA'),
@@ -83,7 +145,7 @@ class Ticket(models.Model):
     sla_breach_time = models.DateTimeField(null=True, blank=True)
 
     # Source & Channel
-    source = models.CharField(
+    source = InternedCharField(
         max_length=50,
         choices=[
             ('email', 'Email'),
@@ -128,11 +190,40 @@ class Ticket(models.Model):
             models.Index(fields=['assigned_agent', 'status']),
             models.Index(fields=['customer_email']),
             models.Index(fields=['created_at']),
+            # Matches the default list ordering so Postgres can
+            # index-scan instead of sorting every page
+            models.Index(fields=['-priority', 'created_at'],
+                         name='tkt_priority_order_idx'),
+            # Partial index over the "active tickets" working set hit by
+            # the dashboard, SLA checker and overdue counts
+            models.Index(fields=['status', 'created_at'],
+                         condition=models.Q(status__in=['new', 'open', 'in_progress']),
+                         name='tkt_active_idx'),
+            # Backs the full-text spam sweep; the expression must match
+            # the SearchVector the task builds for the planner to use it
+            GinIndex(SearchVector('title', 'description', config='english'),
+                     name='tkt_spam_search_idx'),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Stash the raw tuples the row was loaded with so change
+        # tracking can diff against them instead of re-SELECTing the
+        # old row; keeping the two references costs nothing per row —
+        # the tracking signal zips them into a dict only when a save
+        # actually needs to diff
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_raw = (field_names, values)
+        return instance
+
     def save(self, *args, **kwargs):
-        if not self.ticket_id:
-            self.ticket_id = f"TKT-{timezone.now().strftime('%Y%m%d')}-{str(self.id)[:8].upper()}"
+        # Denormalized at write time so list serialization doesn't
+        # recompute initials per ticket per response
+        if self.customer_name:
+            parts = self.customer_name.split()
+            self.customer_initials = ''.join(p[0].upper() for p in parts[:2])
+        elif self.customer_email:
+            self.customer_initials = self.customer_email[:2].upper()
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -197,6 +288,7 @@ class TicketAttachment(models.Model):
     file = models.FileField(upload_to='ticket_attachments/%Y/%m/')
     filename = models.CharField(max_length=255)
     file_size = models.IntegerField()
+    file_size_display = models.CharField(max_length=16, blank=True, editable=False)
     mime_type = models.CharField(max_length=100)
 
     uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -205,6 +297,20 @@ class TicketAttachment(models.Model):
     class Meta:
         ordering = ['-uploaded_at']
 
+    def save(self, *args, **kwargs):
+        # Human-readable size is fixed at upload, so compute it once
+        # here instead of per serialization
+        if self.file_size and not self.file_size_display:
+            size = float(self.file_size)
+            for unit in ['B', 'KB', 'MB', 'GB']:
+                if size < 1024.0:
+                    self.file_size_display = f"{size:.1f} {unit}"
+                    break
+                size /= 1024.0
+            else:
+                self.file_size_display = f"{size:.1f} TB"
+        super().save(*args, **kwargs)
+
 
 class SLAPolicy(models.Model):
     """
@@ -216,12 +322,7 @@ class SLAPolicy(models.Model):
     # Conditions
     priority = models.CharField(
         max_length=20,
-        choices=[
-            ('urgent', 'Urgent'),
-            ('high', 'High'),
-            ('medium', 'Medium'),
-            ('low', 'Low'),
-        ]
+        choices=PRIORITY_CHOICES
     )
     category = models.CharField(max_length=100, blank=True)
 
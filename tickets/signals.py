@@ -1,91 +1,162 @@
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Coalesce
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 from .models import Ticket, TicketHistory, TicketComment
 
 
+@contextmanager
+def no_ticket_signals():
+    """Temporarily disconnect the Ticket save handlers.
+
+    For bulk pipelines that must call save() per row (imports,
+    backfills, management commands) the tracking and classification
+    handlers are pure overhead — the caller is expected to write its
+    own history rows in one bulk_create. Set-based flows built on
+    queryset.update()/bulk_create skip signals anyway and don't need
+    this.
+    """
+    # disconnect() reports whether the receiver was attached; only
+    # reconnect what was actually connected so the manager restores the
+    # prior state instead of force-enabling handlers on exit
+    had_tracking = pre_save.disconnect(track_ticket_changes, sender=Ticket)
+    had_classify = post_save.disconnect(auto_classify_ticket, sender=Ticket)
+    had_baseline = post_save.disconnect(refresh_change_baseline, sender=Ticket)
+    try:
+        yield
+    finally:
+        if had_tracking:
+            pre_save.connect(track_ticket_changes, sender=Ticket)
+        if had_classify:
+            post_save.connect(auto_classify_ticket, sender=Ticket)
+        if had_baseline:
+            post_save.connect(refresh_change_baseline, sender=Ticket)
+
+# Fields whose changes produce history rows; saves that touch none of
+# them skip tracking entirely
+_TRACKED_FIELDS = {'status', 'priority', 'assigned_agent', 'assigned_agent_id'}
+
+
 @receiver(pre_save, sender=Ticket)
 def track_ticket_changes(sender, instance, **kwargs):
-    """Track changes to ticket fields"""
-    if instance.pk:  # Only for existing tickets
-        try:
-            old_ticket = Ticket.objects.get(pk=instance.pk)
-
-            # Track status changes
-            if old_ticket.status != instance.status:
-                TicketHistory.objects.create(
-                    ticket=instance,
-                    action='status_changed',
-                    field_changed='status',
-                    old_value=old_ticket.status,
-                    new_value=instance.status
-                )
-
-                # Set resolved time
-                if instance.status == 'resolved' and not instance.resolved_at:
-                    instance.resolved_at = timezone.now()
-
-            # Track assignment changes
-            if old_ticket.assigned_agent != instance.assigned_agent:
-                TicketHistory.objects.create(
-                    ticket=instance,
-                    action='assigned',
-                    field_changed='assigned_agent',
-                    old_value=str(old_ticket.assigned_agent) if old_ticket.assigned_agent else None,
-                    new_value=str(instance.assigned_agent) if instance.assigned_agent else None
-                )
-
-            # Track priority changes
-            if old_ticket.priority != instance.priority:
-                TicketHistory.objects.create(
-                    ticket=instance,
-                    action='priority_changed',
-                    field_changed='priority',
-                    old_value=old_ticket.priority,
-                    new_value=instance.priority
-                )
-
-        except Ticket.DoesNotExist:
-            pass
+    """Track changes to ticket fields.
+
+    Diffs against the values the instance was loaded with
+    (Ticket.from_db) instead of re-fetching the old row, so tracking
+    adds no SELECT. Saves narrowed with update_fields that don't touch
+    a tracked field return immediately, and the history rows for one
+    save go in as a single bulk_create after commit.
+    """
+    if not instance.pk:  # Only for existing tickets
+        return
+
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and _TRACKED_FIELDS.isdisjoint(update_fields):
+        return
+
+    loaded = getattr(instance, '_loaded_raw', None)
+    if loaded is not None:
+        old = dict(zip(*loaded))
+    else:
+        # Instance wasn't loaded from the DB (e.g. constructed by pk);
+        # fall back to one narrow SELECT of just the tracked columns
+        old = Ticket.objects.filter(pk=instance.pk).values(
+            'status', 'priority', 'assigned_agent_id'
+        ).first()
+        if old is None:
+            return
+
+    history = []
+
+    # Track status changes
+    if 'status' in old and old['status'] != instance.status:
+        history.append(TicketHistory(
+            ticket=instance,
+            action='status_changed',
+            field_changed='status',
+            old_value=old['status'],
+            new_value=instance.status
+        ))
+
+        # Set resolved time
+        if instance.status == 'resolved' and not instance.resolved_at:
+            instance.resolved_at = timezone.now()
+
+    # Track assignment changes
+    if 'assigned_agent_id' in old and old['assigned_agent_id'] != instance.assigned_agent_id:
+        history.append(TicketHistory(
+            ticket=instance,
+            action='assigned',
+            field_changed='assigned_agent',
+            old_value=str(old['assigned_agent_id']) if old['assigned_agent_id'] else None,
+            new_value=str(instance.assigned_agent) if instance.assigned_agent else None
+        ))
+
+    # Track priority changes
+    if 'priority' in old and old['priority'] != instance.priority:
+        history.append(TicketHistory(
+            ticket=instance,
+            action='priority_changed',
+            field_changed='priority',
+            old_value=old['priority'],
+            new_value=instance.priority
+        ))
+
+    if history:
+        transaction.on_commit(
+            lambda: TicketHistory.objects.bulk_create(history)
+        )
 
 
 @receiver(post_save, sender=Ticket)
-def auto_classify_ticket(sender, instance, created, **kwargs):
-    """Automatically classify ticket on creation"""
-    if created:
-        from chatbot.ticket_classifier import ticket_classifier
+def refresh_change_baseline(sender, instance, **kwargs):
+    """Re-baseline change tracking after a successful save.
+
+    Without this, saving the same instance twice would diff against
+    the original load-time values both times and record the first
+    change again. Only the tracked columns are needed.
+    """
+    instance._loaded_raw = (
+        ('status', 'priority', 'assigned_agent_id'),
+        (instance.status, instance.priority, instance.assigned_agent_id),
+    )
 
-        try:
-            # Run AI classification
-            classification = ticket_classifier.classify_ticket(
-                title=instance.title,
-                description=instance.description
-            )
 
-            # Update ticket with classification results
-            Ticket.objects.filter(pk=instance.pk).update(
-                category=classification['category'],
-                priority=classification['priority'],
-                ai_confidence=classification['category_confidence'],
-                ai_suggestions=classification,
-                tags=classification['tags']
-            )
+@receiver(post_save, sender=Ticket)
+def auto_classify_ticket(sender, instance, created, **kwargs):
+    """Queue AI classification when a ticket is created.
+
+    The classifier is an ML inference call; running it inline here
+    blocked the request that created the ticket for the model's full
+    latency. The work happens in the classify_new_ticket worker task
+    instead, enqueued after commit so the worker can't race a ticket
+    row that isn't visible yet.
+    """
+    if created:
+        from django.db import transaction
+        from .tasks import classify_new_ticket
 
-        except Exception as e:
-            print(f"Error in auto-classification: {e}")
+        transaction.on_commit(
+            lambda: classify_new_ticket.delay(instance.pk)
+        )
 
 
 @receiver(post_save, sender=TicketComment)
 def update_ticket_on_comment(sender, instance, created, **kwargs):
-    """Update ticket timestamps when comment is added"""
-    if created:
-        ticket = instance.ticket
-
-        # Update first response time if this is first agent response
-        if instance.author != ticket.customer_email and not ticket.first_response_at:
-            ticket.first_response_at = timezone.now()
-            ticket.save(update_fields=['first_response_at'])
+    """Update ticket timestamps when comment is added.
 
-        # Update ticket updated_at
-        ticket.updated_at = timezone.now()
-        ticket.save(update_fields=['updated_at'])
+    One UPDATE covers both columns: Coalesce keeps an existing
+    first_response_at and fills it from the first comment otherwise.
+    Using a queryset update avoids loading the ticket and avoids two
+    save() calls (each of which ran the pre_save tracking hook).
+    """
+    if created:
+        now = timezone.now()
+        Ticket.objects.filter(pk=instance.ticket_id).update(
+            first_response_at=Coalesce('first_response_at', Value(now)),
+            updated_at=now
+        )
@@ -4,9 +4,13 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Avg
+from django.contrib.auth.models import User
+from django.db.models import Count, Avg, Q
+from django.utils import timezone
 from .models import Ticket, TicketComment
-from .serializers import TicketSerializer, TicketCommentSerializer
+from .serializers import (
+    TicketSerializer, TicketListSerializer, TicketCommentSerializer
+)
 
 
 class TicketViewSet(viewsets.ModelViewSet):
@@ -38,16 +42,62 @@ class TicketViewSet(viewsets.ModelViewSet):
 
     ordering = ['-priority', 'created_at']
 
+    def get_serializer_class(self):
+        """Slim serializer for lists, full serializer elsewhere"""
+        if self.action == 'list':
+            return TicketListSerializer
+        return TicketSerializer
+
     def get_queryset(self):
         """Filter tickets based on user permissions"""
+        from django.db.models import Prefetch
+
         user = self.request.user
 
-        # Admins can see all tickets
-        if hasattr(user, 'tenant-user') and user.tenantuser.role in ['owner', 'admin', 'agent']:
-            return Ticket.objects.all()
+        if self.action == 'list':
+            # The slim list serializer touches none of the JSON/large
+            # text columns (description, ai_suggestions, ...), so don't
+            # fetch or deserialize them; the agent join carries only the
+            # name columns. Comments/attachments aren't rendered here,
+            # so no prefetch either.
+            queryset = Ticket.objects.select_related('assigned_agent').only(
+                'id', 'ticket_id', 'title', 'status', 'priority',
+                'category', 'customer_name', 'customer_email',
+                'customer_initials', 'source', 'sla_status', 'due_date',
+                'created_at', 'updated_at', 'assigned_agent',
+                'assigned_agent__first_name', 'assigned_agent__last_name'
+            )
+        elif self.action == 'metrics':
+            # Pure aggregation — no serializer runs, so joining the
+            # agent row or prefetching comments/attachments would only
+            # add work
+            queryset = Ticket.objects.all()
+        else:
+            # Eager-load everything the detail serializer renders:
+            # nested comments and attachments arrive in two queries
+            # total instead of two per ticket, and the agent join covers
+            # assigned_agent_name
+            queryset = Ticket.objects.select_related('assigned_agent').prefetch_related(
+                Prefetch(
+                    'comments',
+                    # author join feeds author_name without a query per
+                    # comment
+                    queryset=TicketComment.objects.select_related(
+                        'author'
+                    ).order_by('created_at')
+                ),
+                'attachments'
+            )
+
+        # Admins can see all tickets (membership resolved once per
+        # request by the tenant middleware)
+        from tenants.utils import current_tenant_user
+        tenant_user = current_tenant_user(self.request)
+        if tenant_user is not None and tenant_user.role in ['owner', 'admin', 'agent']:
+            return queryset
 
         # Regular users can only see their own tickets
-        return Ticket.objects.filter(customer_email=user.email)
+        return queryset.filter(customer_email=user.email)
 
     def perform_update(self, serializer):
         """Track changes in ticket history"""
@@ -73,15 +123,11 @@ class TicketViewSet(viewsets.ModelViewSet):
         # Save ticket
         ticket = serializer.save()
 
-        # Create history entries for each change
-        for change in changes:
-            TicketHistory.objects.create(
-                ticket=ticket,
-                action='updated',
-                field_changed=change['field'],
-                old_value=change['old'],
-                new_value=change['new'],
-                user=self.request.user
+        # History rows are written by a worker in one bulk insert
+        if changes:
+            from .tasks import log_ticket_history
+            log_ticket_history.delay(
+                ticket.id, 'updated', self.request.user.id, changes
             )
 
         return ticket
@@ -94,16 +140,17 @@ class TicketViewSet(viewsets.ModelViewSet):
 
         try:
             agent = User.objects.get(id=agent_id)
-            ticket.assigned_agent = agent
-            ticket.status = 'open'
-            ticket.save()
+            # One narrow UPDATE instead of a full-row save plus the
+            # pre_save tracking pass
+            Ticket.objects.filter(pk=ticket.pk).update(
+                assigned_agent=agent,
+                status='open',
+                updated_at=timezone.now()
+            )
 
             # Create history
-            TicketHistory.objects.create(
-                ticket=ticket,
-                action='assigned',
-                user=request.user
-            )
+            from .tasks import log_ticket_history
+            log_ticket_history.delay(ticket.id, 'assigned', request.user.id)
 
             return Response({'status': 'assigned'})
         except User.DoesNotExist:
@@ -118,24 +165,26 @@ class TicketViewSet(viewsets.ModelViewSet):
         ticket = self.get_object()
         resolution_notes = request.data.get('resolution_notes', '')
 
-        ticket.status = 'resolved'
-        ticket.resolution_notes = resolution_notes
-        ticket.resolved_at = timezone.now()
+        now = timezone.now()
+        updates = {
+            'status': 'resolved',
+            'resolution_notes': resolution_notes,
+            'resolved_at': now,
+            'updated_at': now,
+        }
 
         # Calculate resolution time
         if ticket.first_response_at:
-            ticket.resolution_time_minutes = int(
-                (timezone.now() - ticket.first_response_at).total_seconds() / 60
+            updates['resolution_time_minutes'] = int(
+                (now - ticket.first_response_at).total_seconds() / 60
             )
 
-        ticket.save()
+        # Write everything with one statement
+        Ticket.objects.filter(pk=ticket.pk).update(**updates)
 
         # Create history
-        TicketHistory.objects.create(
-            ticket=ticket,
-            action='resolved',
-            user=request.user
-        )
+        from .tasks import log_ticket_history
+        log_ticket_history.delay(ticket.id, 'resolved', request.user.id)
 
         return Response({'status': 'resolved'})
 
@@ -144,45 +193,85 @@ class TicketViewSet(viewsets.ModelViewSet):
         """Get ticket metrics for dashboard"""
         queryset = self.get_queryset()
 
+        # One scan with filtered aggregates replaces four separate
+        # round-trips for the scalar figures; the three histograms stay
+        # as their own GROUP BYs
+        scalars = queryset.aggregate(
+            total=Count('id'),
+            unassigned=Count('id', filter=Q(assigned_agent__isnull=True)),
+            overdue=Count('id', filter=Q(
+                due_date__lt=timezone.now(),
+                status__in=['new', 'open', 'in_progress']
+            )),
+            avg_resolution_time=Avg('resolution_time_minutes'),
+        )
+
         metrics = {
-            'total': queryset.count(),
+            **scalars,
             'by_status': dict(queryset.values('status').annotate(count=Count('id')).values_list('status', 'count')),
             'by_priority': dict(
                 queryset.values('priority').annotate(count=Count('id')).values_list('priority', 'count')),
             'by_category': dict(
                 queryset.values('category').annotate(count=Count('id')).values_list('category', 'count')),
-            'unassigned': queryset.filter(assigned_agent__isnull=True).count(),
-            'overdue': queryset.filter(due_date__lt=timezone.now(), status__in=['new', 'open', 'in_progress']).count(),
-            'avg_resolution_time': queryset.filter(resolution_time_minutes__isnull=False).aggregate(
-                avg_time=Avg('resolution_time_minutes')
-            )['avg_time']
         }
 
         return Response(metrics)
 
     @action(detail=False, methods=['post'])
     def bulk_update(self, request):
-        """Bulk update tickets"""
+        """Bulk update tickets with one UPDATE plus one history insert"""
+        from .models import TicketHistory
+
         ticket_ids = request.data.get('ticket_ids', [])
-        statu = request.data.get('status')
+        new_status = request.data.get('status')
         assigned_agent_id = request.data.get('assigned_agent_id')
 
         if not ticket_ids:
             return Response(
                 {'error': 'No tickets selected'},
-                status=statu.HTTP_400_BAD_REQUEST
+                status=status.HTTP_400_BAD_REQUEST
             )
 
-        tickets = Ticket.objects.filter(id__in=ticket_ids)
-        updated_count = 0
-
-        for ticket in tickets:
-            if statu:
-                ticket.status = statu
-            if assigned_agent_id:
-                ticket.assigned_agent_id = assigned_agent_id
-
-            ticket.save()
-            updated_count += 1
+        updates = {}
+        if new_status:
+            updates['status'] = new_status
+        if assigned_agent_id:
+            updates['assigned_agent_id'] = assigned_agent_id
+
+        if not updates:
+            return Response({'updated_count': 0})
+
+        # Snapshot old values first so history can record real diffs,
+        # then flip the whole batch in a single statement instead of a
+        # save (and signal round) per row
+        old_rows = list(
+            Ticket.objects.filter(id__in=ticket_ids).values(
+                'id', 'status', 'assigned_agent_id'
+            )
+        )
+        updated_count = Ticket.objects.filter(id__in=ticket_ids).update(**updates)
+
+        history = []
+        for row in old_rows:
+            if new_status and row['status'] != new_status:
+                history.append(TicketHistory(
+                    ticket_id=row['id'],
+                    user=request.user,
+                    action='bulk_updated',
+                    field_changed='status',
+                    old_value=row['status'],
+                    new_value=new_status
+                ))
+            if assigned_agent_id and str(row['assigned_agent_id']) != str(assigned_agent_id):
+                history.append(TicketHistory(
+                    ticket_id=row['id'],
+                    user=request.user,
+                    action='bulk_updated',
+                    field_changed='assigned_agent',
+                    old_value=str(row['assigned_agent_id'] or ''),
+                    new_value=str(assigned_agent_id)
+                ))
+        if history:
+            TicketHistory.objects.bulk_create(history, batch_size=500)
 
         return Response({'updated_count': updated_count})